@@ -24,3 +24,13 @@
 ## end license ##
 
 from .enrich import *
+from .lookup import *
+from .enrich_async import *
+from .parallel import *
+from .vocabulary import *
+from .vocabulary_index import *
+from .dependencies import *
+from .fingerprint import *
+from .threaded import *
+from .reports import *
+from .persistent import *
@@ -0,0 +1,435 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+"""Benchmark for the enrich pipeline on synthetic Edurep records.
+
+python -m kennisnet.jsonld.benchmark --records 5000 --save baseline.json
+python -m kennisnet.jsonld.benchmark --records 5000 --compare baseline.json
+"""
+
+from .enrich import prepare_enrich
+from .defined_term import result_to_defined_term
+from .fingerprint import fingerprinted
+from .reports import ReportCollector
+from .lookup import TableLookup
+from .ns import schema, lom, dcterms, edurep_terms
+import kennisnet.jsonld.utils as utils
+from argparse import ArgumentParser
+from copy import deepcopy
+from time import perf_counter_ns
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+conceptset = "urn:edurep:conceptset"
+begrippenkader = "http://purl.edustandaard.nl/begrippenkader"
+concept_types = [
+    edurep_terms + "EducationalLevel",
+    edurep_terms + "EducationalObjective",
+    edurep_terms + "Discipline",
+    None,
+]
+
+text_schemes = {
+    "urn:lms:status": ["definitief", "concept", "herzien"],
+    "urn:lms:mimetype": ["text/html", "application/pdf", "video/mp4", "image/png"],
+    "urn:lms:interactivitytype": ["actief", "expositief", "gemengd"],
+    "urn:lms:accessrights": ["OpenAccess", "RestrictedAccess"],
+    "urn:lms:aggregationlevel": ["1", "2", "3", "4"],
+    "urn:lms:cost": ["ja", "nee"],
+    "urn:lms:intendedenduserrole": ["learner", "teacher", "author"],
+}
+licenses = ["cc-by-40", "cc-by-sa-40", "cc-by-nc-40", "cc0-10"]
+
+
+def concept_id(n):
+    return f"{begrippenkader}/{n:08x}-0000-4000-8000-{n:012x}"
+
+
+def synthetic_lookup_table(concepts=500):
+    by_value = {
+        scheme: {v: {"id": f"{scheme}#{v}", "identifier": v} for v in values}
+        for scheme, values in text_schemes.items()
+    }
+    by_value["urn:lms:license"] = {
+        v: {
+            "uri": f"http://creativecommons.org/licenses/{v}/",
+            "labels": [[v.upper(), "nl"]],
+        }
+        for v in licenses
+    }
+    by_value[conceptset] = {}
+    by_id = {conceptset: {}}
+    for n in range(concepts):
+        result = {
+            "id": concept_id(n),
+            "identifier": f"{n:08x}",
+            "source": begrippenkader,
+            "labels": [[f"Begrip {n}", "nl"]],
+            "type": concept_types[n % len(concept_types)],
+        }
+        if n % 10 == 0 and n + 1 < concepts:
+            result["exactMatch"] = concept_id(n + 1)
+        by_value[conceptset][f"Begrip {n}"] = result
+        by_id[conceptset][concept_id(n)] = result
+    return {"byValue": by_value, "byId": by_id}
+
+
+def values(*vs):
+    return [{"@value": v} for v in vs]
+
+
+def defined_term(rng, concepts, target_p):
+    n = rng.randrange(concepts)
+    if target_p == schema + "educationalAlignment":
+        return {
+            "@type": [schema + "AlignmentObject"],
+            "@id": concept_id(n),
+            schema + "educationalFramework": values(begrippenkader),
+            schema + "targetName": values(f"Begrip {n}"),
+        }
+    if rng.random() < 0.5:
+        return {"@id": concept_id(n)}
+    return {
+        "@type": [schema + "DefinedTerm"],
+        schema + "inDefinedTermSet": values("http://download.edustandaard.nl/vdex"),
+        schema + "termCode": values(f"Begrip {n}"),
+    }
+
+
+def synthetic_record(
+    rng,
+    i,
+    keywords=10,
+    terms=3,
+    learning_resource_types=2,
+    license=True,
+    concepts=500,
+):
+    """An expanded record with the given number of keywords, learningResourceType
+    entries and educationalLevel/teaches/educationalAlignment terms each."""
+    record = {
+        "@id": f"urn:record:{i}",
+        "@type": [schema + "LearningResource"],
+        schema + "name": values(f"Record {i}"),
+        schema + "description": values("Lorem ipsum dolor sit amet. " * 5),
+        schema + "dateModified": values(f"2023-{i % 12 + 1:02d}-11T12:34:56Z"),
+        schema + "creativeWorkStatus": values("definitief"),
+        schema + "encodingFormat": values(rng.choice(["text/html", "text/unknown"])),
+        schema + "interactivityType": values("actief"),
+        dcterms + "accessRights": values("OpenAccess"),
+        lom + "aggregationLevel": values("2"),
+        lom + "cost": values(rng.choice(["ja", "nee"])),
+        schema
+        + "audience": [
+            {"@type": [schema + "Audience"], schema + "audienceType": values("learner")}
+        ],
+    }
+    record[schema + "keywords"] = [
+        (
+            {
+                "@type": [schema + "DefinedTerm"],
+                schema + "termCode": values(f"Begrip {rng.randrange(concepts)}"),
+            }
+            if k % 2
+            else {"@value": f"trefwoord {rng.randrange(10000)}"}
+        )
+        for k in range(keywords)
+    ]
+    for target_p in ["educationalLevel", "teaches", "educationalAlignment"]:
+        record[schema + target_p] = [
+            defined_term(rng, concepts, schema + target_p) for _ in range(terms)
+        ]
+    record[schema + "learningResourceType"] = [
+        {
+            "@type": [schema + "DefinedTerm"],
+            schema
+            + "inDefinedTermSet": values(
+                "http://purl.edustandaard.nl/vdex_learningresourcetype_czp_20060628.xml"
+            ),
+            schema + "termCode": values(f"type {t}"),
+        }
+        for t in range(learning_resource_types)
+    ]
+    if license:
+        record[lom + "copyrightAndOtherRestrictions"] = values(rng.choice(licenses))
+        record[schema + "copyrightNotice"] = values("Some notice")
+    return record
+
+
+def synthetic_records(n, seed=0, **kwargs):
+    rng = random.Random(seed)
+    return [synthetic_record(rng, i, **kwargs) for i in range(n)]
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def measure(fn, records, on_timed=None):
+    """Calls fn for each record; returns throughput, per record latency in ms
+    and the peak of traced memory in KiB, overall and the mean of the memory
+    allocated on top while enriching one record (measured in a separate pass
+    on copies of the first 100 records).
+    record_blocks is the mean number of memory blocks still allocated after
+    one call, while its result is alive and the garbage collector is paused.
+    on_timed is called after the timed pass, before the memory pass."""
+    timings = []
+    start = perf_counter_ns()
+    for record in records:
+        t0 = perf_counter_ns()
+        fn(record)
+        timings.append(perf_counter_ns() - t0)
+    total = perf_counter_ns() - start
+    if on_timed is not None:
+        on_timed()
+    timings.sort()
+    copies = deepcopy(records[:100])
+    record_peaks = []
+    record_blocks = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for record in copies:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            blocks = sys.getallocatedblocks()
+            result = fn(record)
+            record_blocks.append(sys.getallocatedblocks() - blocks)
+            record_peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            del result
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if gc_enabled:
+            gc.enable()
+    return {
+        "records": len(records),
+        "records_per_sec": round(len(records) / (total / 1e9), 1),
+        "p50_ms": round(percentile(timings, 0.50) / 1e6, 4),
+        "p99_ms": round(percentile(timings, 0.99) / 1e6, 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "record_peak_kb": round(sum(record_peaks) / len(record_peaks) / 1024, 1),
+        "record_blocks": round(sum(record_blocks) / len(record_blocks)),
+    }
+
+
+def bench_enrich(records=1000, concepts=500, enrich_kwargs=None, **kwargs):
+    lookup = TableLookup(synthetic_lookup_table(concepts))
+    enrich = prepare_enrich(lookup, **(enrich_kwargs or {}))[0]
+    return measure(enrich, synthetic_records(records, concepts=concepts, **kwargs))
+
+
+def bench_enrich_inplace(**kwargs):
+    return bench_enrich(enrich_kwargs={"inplace": True}, **kwargs)
+
+
+def bench_enrich_compiled(**kwargs):
+    return bench_enrich(enrich_kwargs={"compiled": True}, **kwargs)
+
+
+def bench_enrich_fingerprinted(records=1000, concepts=500, **kwargs):
+    """Every record is enriched twice, like two harvests without changes.
+    Each harvest has its own copies of the records, as enrich changes its
+    input."""
+    lookup = TableLookup(synthetic_lookup_table(concepts))
+    enrich = fingerprinted(prepare_enrich(lookup)[0])
+    harvest = records // 2 or 1
+    data = [
+        record
+        for _ in range(2)
+        for record in synthetic_records(harvest, concepts=concepts, **kwargs)
+    ]
+    stats = {}
+    result = measure(enrich, data[:records], lambda: stats.update(enrich.stats()))
+    return result | {"hit_rate": round(stats["hit_rate"], 3)}
+
+
+def synthetic_term_lookups(n, concepts=500, seed=0):
+    """(lookup result, target predicate) pairs for popular concepts."""
+    rng = random.Random(seed)
+    lookup = TableLookup(synthetic_lookup_table(concepts))
+    targets = [
+        schema + p for p in ["educationalLevel", "teaches", "educationalAlignment"]
+    ]
+    return [
+        (
+            lookup.lookupById(
+                conceptset, concept_id(int(rng.paretovariate(1)) % concepts)
+            ),
+            rng.choice(targets),
+        )
+        for _ in range(n)
+    ]
+
+
+def bench_result_to_defined_term(records=1000, concepts=500, **kwargs):
+    return measure(
+        lambda r: result_to_defined_term(*r), synthetic_term_lookups(records, concepts)
+    )
+
+
+def synthetic_dates(n, seed=0, repeated=0.5):
+    """Timestamps in the shapes seen in records; a fraction is repeated."""
+    rng = random.Random(seed)
+    common = [f"2023-01-{d:02d}T12:00:00Z" for d in range(1, 29)]
+
+    def date():
+        if rng.random() < repeated:
+            return rng.choice(common)
+        return rng.choice(
+            [
+                "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}Z",
+                "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}+01:00",
+                "{:04d}-{:02d}-{:02d}",
+            ]
+        ).format(
+            rng.randrange(2000, 2025),
+            rng.randrange(1, 13),
+            rng.randrange(1, 29),
+            rng.randrange(24),
+            rng.randrange(60),
+            rng.randrange(60),
+        )
+
+    return [date() for _ in range(n)]
+
+
+def bench_normalize_datetime(records=1000, **kwargs):
+    utils._normalize_datetime_str.cache_clear()
+    return measure(utils.normalize_datetime, synthetic_dates(records))
+
+
+def bench_normalize_datetime_zulutime(records=1000, **kwargs):
+    return measure(utils._zulu, synthetic_dates(records))
+
+
+def synthetic_reports(n, seed=0):
+    """(key, value) invalid reports: a few common unknown values per key and a
+    long tail of free text."""
+    rng = random.Random(seed)
+    keys = ["schema:encodingFormat", "schema:educationalLevel", "schema:keywords"]
+    return [
+        (rng.choice(keys), f"unknown {int(rng.paretovariate(0.5))}") for _ in range(n)
+    ]
+
+
+def bench_report_heavy_hitters(records=1000, reports_per_record=1000, **kwargs):
+    """Every record is a batch of reports; with --records 20000 this counts
+    20 million reports. Batches are repeated after the first 100."""
+    reports = ReportCollector()
+    batches = [
+        synthetic_reports(reports_per_record, seed=i) for i in range(min(records, 100))
+    ]
+
+    def report(batch):
+        for key, value in batch:
+            reports.report_invalid(key, value)
+
+    counted = {}
+    result = measure(
+        report,
+        [batches[i % len(batches)] for i in range(records)],
+        lambda: counted.update(reports=sum(reports.totals.values())),
+    )
+    return result | {
+        "reports": counted["reports"],
+        "reports_per_sec": round(result["records_per_sec"] * reports_per_record),
+    }
+
+
+scenarios = {
+    "enrich": bench_enrich,
+    "enrich_inplace": bench_enrich_inplace,
+    "enrich_compiled": bench_enrich_compiled,
+    "enrich_fingerprinted": bench_enrich_fingerprinted,
+    "result_to_defined_term": bench_result_to_defined_term,
+    "normalize_datetime": bench_normalize_datetime,
+    "normalize_datetime_zulutime": bench_normalize_datetime_zulutime,
+    "report_heavy_hitters": bench_report_heavy_hitters,
+}
+
+
+def compare(results, baseline, max_regression=0.1):
+    """Returns the scenarios whose throughput dropped more than max_regression
+    (a fraction) compared to the baseline."""
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["records_per_sec"]
+        if result["records_per_sec"] < before * (1 - max_regression):
+            regressions[name] = (before, result["records_per_sec"])
+    return regressions
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Benchmark the enrich pipeline.")
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--keywords", type=int, default=10)
+    parser.add_argument(
+        "--terms",
+        type=int,
+        default=3,
+        help="educationalLevel, teaches and educationalAlignment terms each",
+    )
+    parser.add_argument("--learning-resource-types", type=int, default=2)
+    parser.add_argument("--no-license", dest="license", action="store_false")
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(scenarios), default=None
+    )
+    parser.add_argument("--save", help="write the results as baseline to this file")
+    parser.add_argument("--compare", help="compare with the baseline in this file")
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = {
+        name: scenarios[name](
+            records=args.records,
+            keywords=args.keywords,
+            terms=args.terms,
+            learning_resource_types=args.learning_resource_types,
+            license=args.license,
+        )
+        for name in args.scenario or scenarios
+    }
+    print(json.dumps(results, indent=2))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for name, (before, after) in regressions.items():
+            print(f"{name}: {before} -> {after} records/sec", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .benchmark import (
+    synthetic_records,
+    synthetic_dates,
+    bench_enrich,
+    bench_enrich_inplace,
+    bench_enrich_compiled,
+    bench_enrich_fingerprinted,
+    bench_result_to_defined_term,
+    bench_normalize_datetime,
+    bench_normalize_datetime_zulutime,
+    bench_report_heavy_hitters,
+    compare,
+    main,
+)
+from .ns import schema
+from .utils import normalize_datetime
+
+import json
+
+
+def test_synthetic_records():
+    records = synthetic_records(3, keywords=4, terms=2, learning_resource_types=1)
+    assert [r["@id"] for r in records] == [f"urn:record:{i}" for i in range(3)]
+    assert len(records[0][schema + "keywords"]) == 4
+    assert len(records[0][schema + "teaches"]) == 2
+    assert len(records[0][schema + "learningResourceType"]) == 1
+    assert records == synthetic_records(
+        3, keywords=4, terms=2, learning_resource_types=1
+    )
+
+
+def test_bench_enrich():
+    result = bench_enrich(records=5)
+    assert result["records"] == 5
+    assert set(result) == {
+        "records",
+        "records_per_sec",
+        "p50_ms",
+        "p99_ms",
+        "peak_memory_kb",
+        "record_peak_kb",
+        "record_blocks",
+    }
+    assert bench_enrich_inplace(records=5)["records"] == 5
+    assert bench_enrich_compiled(records=5)["records"] == 5
+    assert bench_enrich_fingerprinted(records=6)["hit_rate"] == 0.5
+
+
+def test_compare():
+    baseline = {"enrich": {"records_per_sec": 100.0}}
+    assert compare({"enrich": {"records_per_sec": 95.0}}, baseline) == {}
+    assert compare({"enrich": {"records_per_sec": 80.0}}, baseline) == {
+        "enrich": (100.0, 80.0)
+    }
+    assert compare({"other": {"records_per_sec": 1.0}}, baseline) == {}
+
+
+def test_main(tmp_path, capsys):
+    assert main(["--records", "3", "--save", str(tmp_path / "baseline.json")]) == 0
+    baseline = json.loads((tmp_path / "baseline.json").read_text())
+    assert baseline["enrich"]["records"] == 3
+    assert (
+        main(
+            [
+                "--records",
+                "3",
+                "--compare",
+                str(tmp_path / "baseline.json"),
+                "--max-regression",
+                "1",
+            ]
+        )
+        == 0
+    )
+
+
+def test_bench_normalize_datetime():
+    dates = synthetic_dates(50)
+    assert dates == synthetic_dates(50)
+    assert all(normalize_datetime(d) for d in dates)
+    assert bench_normalize_datetime(records=5)["records"] == 5
+    assert bench_normalize_datetime_zulutime(records=5)["records"] == 5
+
+
+def test_bench_result_to_defined_term():
+    assert bench_result_to_defined_term(records=5)["records"] == 5
+
+
+def test_bench_report_heavy_hitters():
+    result = bench_report_heavy_hitters(records=3, reports_per_record=10)
+    assert result["records"] == 3
+    assert result["reports"] == 30
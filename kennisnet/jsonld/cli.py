@@ -0,0 +1,114 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from .lookup import TableLookup
+from .vocabulary import VocabularyLookup
+from .vocabulary_index import MappedLookup
+from .parallel import enrich_many, ReportingLookup
+from .reports import ReportCollector
+from argparse import ArgumentParser, FileType
+from functools import partial
+import json
+import sys
+
+
+def read_records(lines):
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def enrich_records(records, lookup_factory, summary, workers=1, **enrich_kwargs):
+    if workers > 1:
+        yield from enrich_many(
+            records, lookup_factory, workers=workers, reporter=summary, **enrich_kwargs
+        )
+        return
+    lookup = ReportingLookup(lookup_factory())
+    enrich = prepare_enrich(lookup, **enrich_kwargs)[0]
+    for data in records:
+        yield enrich(data)
+        for method, key, value in lookup.reports:
+            getattr(summary, method)(key, value)
+        lookup.reports.clear()
+
+
+def main(argv=None):
+    parser = ArgumentParser(
+        description="Enrich expanded JSON-LD records, one JSON object per line."
+    )
+    parser.add_argument("input", nargs="?", type=FileType("r"), default=sys.stdin)
+    parser.add_argument(
+        "-o", "--output", type=FileType("w"), default=sys.stdout, help="default: stdout"
+    )
+    lookups = parser.add_mutually_exclusive_group(required=True)
+    lookups.add_argument(
+        "--lookup",
+        help='JSON file with a lookup table {"byValue": ..., "byId": ...}',
+    )
+    lookups.add_argument(
+        "--vocabulary",
+        help="JSON or NDJSON vocabulary dump with concepts per scheme",
+    )
+    lookups.add_argument(
+        "--index",
+        help="vocabulary index file (python -m kennisnet.jsonld.vocabulary_index)",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--prefetch", action="store_true", help="resolve lookups per record in bulk"
+    )
+    parser.add_argument(
+        "--no-summary",
+        dest="summary",
+        action="store_false",
+        help="do not write the invalid/not found summary to stderr",
+    )
+    args = parser.parse_args(argv)
+
+    summary = ReportCollector()
+    if args.vocabulary:
+        lookup_factory = partial(VocabularyLookup.from_file, args.vocabulary)
+    elif args.index:
+        lookup_factory = partial(MappedLookup, args.index)
+    else:
+        lookup_factory = partial(TableLookup.from_file, args.lookup)
+    results = enrich_records(
+        read_records(args.input),
+        lookup_factory,
+        summary,
+        workers=args.workers,
+        prefetch=args.prefetch,
+    )
+    for result in results:
+        args.output.write(json.dumps(result) + "\n")
+    args.output.flush()
+    if args.summary:
+        summary.write(sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
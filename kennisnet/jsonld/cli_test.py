@@ -0,0 +1,125 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .cli import main
+from .enrich import prepare_enrich
+from .enrich_test import MockLookup, example, testlookupdata
+from .vocabulary_index import compile_dump
+
+import json
+import pytest
+
+
+def as_table(lookupdata):
+    return {
+        kind: {
+            scheme: {value: result._asdict() for value, result in results.items()}
+            for scheme, results in schemes.items()
+        }
+        for kind, schemes in lookupdata.items()
+    }
+
+
+def records():
+    return [
+        example({"schema:creativeWorkStatus": "definitief"})[0],
+        example({"schema:encodingFormat": ["text/nonsense", "text/nonsense"]})[0],
+        example({"schema:educationalLevel": {"@id": "uri:has_match"}})[0],
+        example({"lom:copyrightAndOtherRestrictions": "cc-by-40"})[0],
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_main(tmp_path, capsys, workers):
+    (tmp_path / "lookup.json").write_text(json.dumps(as_table(testlookupdata)))
+    (tmp_path / "in.ndjson").write_text(
+        "\n".join(json.dumps(r) for r in records()) + "\n\n"
+    )
+    main(
+        [
+            str(tmp_path / "in.ndjson"),
+            "--output",
+            str(tmp_path / "out.ndjson"),
+            "--lookup",
+            str(tmp_path / "lookup.json"),
+            "--workers",
+            str(workers),
+        ]
+    )
+    enrich = prepare_enrich(MockLookup())[0]
+    expected = [enrich(r) for r in records()]
+    with open(tmp_path / "out.ndjson") as f:
+        assert [json.loads(line) for line in f] == expected
+    assert capsys.readouterr().err == (
+        "invalid schema:encodingFormat: 2\n           2 text/nonsense\n"
+    )
+
+
+@pytest.mark.parametrize("option", ["--vocabulary", "--index"])
+def test_main_vocabulary(tmp_path, capsys, option):
+    (tmp_path / "vocabulary.ndjson").write_text(
+        json.dumps({"scheme": "urn:lms:status", "id": "final", "identifier": "final"})
+        + "\n"
+        + json.dumps(
+            {
+                "scheme": "urn:lms:license",
+                "id": "cc-by-40",
+                "uri": "http://creativecommons.org/licenses/by/4.0/",
+                "prefLabel": {"nl": "CC BY 4.0"},
+            }
+        )
+    )
+    (tmp_path / "in.ndjson").write_text(
+        json.dumps(example({"schema:creativeWorkStatus": "Final"})[0])
+        + "\n"
+        + json.dumps(example({"lom:copyrightAndOtherRestrictions": "cc-by-40"})[0])
+    )
+    vocabulary = str(tmp_path / "vocabulary.ndjson")
+    if option == "--index":
+        compile_dump(vocabulary, str(tmp_path / "vocabulary.idx"))
+        vocabulary = str(tmp_path / "vocabulary.idx")
+    main(
+        [
+            str(tmp_path / "in.ndjson"),
+            "--output",
+            str(tmp_path / "out.ndjson"),
+            option,
+            vocabulary,
+            "--no-summary",
+        ]
+    )
+    with open(tmp_path / "out.ndjson") as f:
+        status, license = [json.loads(line) for line in f]
+    assert status == example({"schema:creativeWorkStatus": "final"})[0]
+    assert (
+        license
+        == example(
+            {
+                "lom:copyrightAndOtherRestrictions": "cc-by-40",
+                "schema:copyrightNotice": {"@language": "nl", "@value": "CC BY 4.0"},
+                "schema:license": "http://creativecommons.org/licenses/by/4.0/",
+            }
+        )[0]
+    )
@@ -24,12 +24,16 @@
 ## end license ##
 
 from .ns import schema, edurep_terms, to_curie
+from .inplace import functional
+from .lookup import NegativeCache, LookupResult
 from metastreams.jsonld import identity, walk, ignore_silently
 import seecr.functools as sfc
 import kennisnet.jsonld.utils as utils
 import seecr.functools.core as sfc
+from functools import lru_cache
 import urllib.parse
 import rfc3987
+import re
 
 
 def with_predicate(target_p, normalize_os=None):
@@ -54,8 +58,28 @@ def remove_duplicate_values(os):
     return result
 
 
+_absolute_iri = rfc3987.get_compiled_pattern("^%(absolute_IRI)s$")
+_iri_scheme = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+# a subset of absolute_IRI (which has no fragment): http(s) with only plain
+# characters, no user info, ip literals or percent encoding
+_plain_http_uri = re.compile(
+    r"https?://[A-Za-z0-9.-]*(?::[0-9]*)?"
+    r"(?:/[A-Za-z0-9._~!$&'()*+,;=:@/-]*)?"
+    r"(?:\?[A-Za-z0-9._~!$&'()*+,;=:@/?-]*)?$"
+)
+
+
+@lru_cache(maxsize=4096)
+def _is_absolute_iri(s):
+    if not _iri_scheme.match(s):
+        return False
+    if _plain_http_uri.match(s):
+        return True
+    return _absolute_iri.match(s) is not None
+
+
 def is_uri(s):
-    return s is not None and rfc3987.match(s, rule="absolute_IRI")
+    return s is not None and _is_absolute_iri(s)
 
 
 def add_id_to_defined_term(term):
@@ -129,36 +153,73 @@ curriculum_uris = {
 }
 
 
-def _startswith_uri(termId, uri):
-    a, b, c = termId.partition(uri)
-    return b == uri and len(c) > 1
+def _trie_pattern(strings):
+    """Regular expression matching any of strings, with common prefixes
+    factored out so matching does not depend on the number of strings."""
+    trie = {}
+    for string in strings:
+        node = trie
+        for ch in string:
+            node = node.setdefault(ch, {})
+        node[""] = None
 
+    def pattern(node):
+        alternatives = [
+            re.escape(ch) + pattern(child) for ch, child in node.items() if ch
+        ]
+        if not alternatives:
+            return ""
+        if len(alternatives) == 1 and "" not in node:
+            return alternatives[0]
+        p = f"(?:{'|'.join(alternatives)})"
+        return p + "?" if "" in node else p
+
+    return pattern(trie)
+
+
+class CurriculumMatcher:
+    """Tells whether a term is a curriculum value: its inDefinedTermSet is
+    one of the curriculum uris (and it has an @id), or its @id starts with
+    one of them followed by more than one character."""
+
+    def __init__(self, uris):
+        self.uris = frozenset(uris)
+        self._id_re = (
+            re.compile(f"({_trie_pattern(self.uris)})..", re.DOTALL)
+            if self.uris
+            else None
+        )
 
-def is_curriculum_waarde_in_term(term, inDefinedTermSet=schema + "inDefinedTermSet"):
-    termSet = sfc.get_in(term, (inDefinedTermSet, 0, "@value"))
-    if termSet and termSet in curriculum_uris:
-        return bool(term.get("@id")), termSet
-    termId = term.get("@id")
-    if termId:
-        for uri in curriculum_uris:
-            if _startswith_uri(termId, uri):
-                return True, uri
-    return False, None
+    def __call__(self, term, inDefinedTermSet=schema + "inDefinedTermSet"):
+        termSet = sfc.get_in(term, (inDefinedTermSet, 0, "@value"))
+        if termSet and termSet in self.uris:
+            return bool(term.get("@id")), termSet
+        termId = term.get("@id")
+        if termId and self._id_re is not None:
+            if m := self._id_re.match(termId):
+                return True, m.group(1)
+        return False, None
 
 
-def result_to_defined_term(lookup_result, target_p):
-    type, termCodeKey, inDefinedTermSetKey = (
-        schema + "DefinedTerm",
-        schema + "termCode",
-        schema + "inDefinedTermSet",
-    )
+is_curriculum_waarde_in_term = CurriculumMatcher(curriculum_uris)
+
+
+def _term_keys(target_p):
     if target_p == schema + "educationalAlignment":
-        type, termCodeKey, inDefinedTermSetKey = (
+        return (
             schema + "AlignmentObject",
             schema + "targetName",
             schema + "educationalFramework",
         )
+    return (
+        schema + "DefinedTerm",
+        schema + "termCode",
+        schema + "inDefinedTermSet",
+    )
+
 
+def result_to_defined_term(lookup_result, target_p):
+    type, termCodeKey, inDefinedTermSetKey = _term_keys(target_p)
     result = {
         "@type": [type],
     }
@@ -183,19 +244,50 @@ type_to_target = {
 }
 
 
-def prep_improve_keyword(lookupObject):
+def keyword_search_for(d):
+    termCode = sfc.get_in(d, (schema + "termCode", 0, "@value"))
+    names = [v["@value"] for v in d.get(schema + "name", {}) if "@value" in v]
+    return names if termCode is None else [termCode] + names
+
+
+def prep_first_typed(lookupObject, misses=None):
+    """Returns first_typed(candidates): the lookup result of the first
+    candidate value in urn:edurep:conceptset with a type, or None. With more
+    than one candidate left they are looked up with one lookupMany call if
+    the lookup object has it. Candidates without a typed result are kept in
+    misses (a NegativeCache) and not looked up again; by default none are
+    kept."""
+    if misses is None:
+        misses = NegativeCache(0)
+    scheme = "urn:edurep:conceptset"
+    lookupMany = getattr(lookupObject, "lookupMany", None)
+
+    def first_typed(candidates):
+        candidates = [c for c in dict.fromkeys(candidates) if c not in misses]
+        if lookupMany is not None and len(candidates) > 1:
+            found = lookupMany([("lookupByValue", scheme, c) for c in candidates])
+            results = (
+                found.get(("lookupByValue", scheme, c), LookupResult())
+                for c in candidates
+            )
+        else:
+            results = (lookupObject.lookupByValue(scheme, c) for c in candidates)
+        for candidate, l_result in zip(candidates, results):
+            if l_result.type:
+                return l_result
+            misses.add(candidate)
+        return None
+
+    return first_typed
+
+
+def prep_improve_keyword(lookupObject, misses=None):
+    first_typed = prep_first_typed(lookupObject, misses)
+
     def improve_keyword(d):
         assert d["@type"] == [schema + "DefinedTerm"]
-        termCode = sfc.get_in(d, (schema + "termCode", 0, "@value"))
-        search_for = [termCode] + [
-            v["@value"] for v in d.get(schema + "name", {}) if "@value" in v
-        ]
-        l_result = None
-        for search in search_for:
-            l_result = lookupObject.lookupByValue("urn:edurep:conceptset", search)
-            if l_result and l_result.type:
-                break
-        if not l_result.id or not l_result.type:
+        l_result = first_typed(keyword_search_for(d))
+        if l_result is None or not l_result.id:
             return schema + "keywords", add_id_to_defined_term(d), None
         target_p = type_to_target[l_result.type]
         return target_p, result_to_defined_term(l_result, target_p), l_result.exactMatch
@@ -203,9 +295,10 @@ def prep_improve_keyword(lookupObject):
     return improve_keyword
 
 
-def improve_keywords(lookupObject):
-    improve_keyword = prep_improve_keyword(lookupObject)
+def improve_keywords(lookupObject, misses=None):
+    improve_keyword = prep_improve_keyword(lookupObject, misses)
 
+    @functional
     def keywords_fn(a, s, p, os):
         """Dit veld wordt gecontroleerd in stap 2.1 van de zogenaamde Flow
         2.1 Op basis van termCode wordt gezocht in prefLabel, altLabel, hiddenLabel op een match. Als in de match een type is opgenomen, dan wordt het keyword verplaatst.
@@ -223,9 +316,16 @@ def improve_keywords(lookupObject):
                 newdata[target_p] = a.get(target_p, [])
             newdata[target_p].append(keyword)
         newdata[p].extend(created_keywords)
-        return a | {k: v for k, v in newdata.items() if v}
+        a.update((k, v) for k, v in newdata.items() if v)
+
+    def lookup_requests(s, p, os):
+        for keyword in os:
+            if keyword.get("@type") == [schema + "DefinedTerm"]:
+                for search in keyword_search_for(keyword):
+                    yield ("lookupByValue", "urn:edurep:conceptset", search)
 
     keywords_fn.lookup_info = {"urn:edurep:conceptset": {}}
+    keywords_fn.lookup_requests = lookup_requests
     return keywords_fn
 
 
@@ -257,7 +357,7 @@ def prep_improve_definedterm(lookupObject):
     return improve_definedterm
 
 
-def defined_term(target_p, lookupObject):
+def defined_term(target_p, lookupObject, curriculum_uris=None, misses=None):
     to_keywords_walk = definition_walk
     copy_walk = definition_walk
     inDefinedTermSet = schema + "inDefinedTermSet"
@@ -267,9 +367,13 @@ def defined_term(target_p, lookupObject):
         copy_walk = definition_alignment_walk
         inDefinedTermSet = schema + "educationalFramework"
         type_object = schema + "AlignmentObject"
-    improve_keyword = prep_improve_keyword(lookupObject)
+    is_curriculum = is_curriculum_waarde_in_term
+    if curriculum_uris is not None:
+        is_curriculum = CurriculumMatcher(curriculum_uris)
+    improve_keyword = prep_improve_keyword(lookupObject, misses)
     improve_definedterm = prep_improve_definedterm(lookupObject)
 
+    @functional
     def defined_term_fn(a, s, p, os):
         """Dit veld wordt gecontroleerd in 3 stappen, de zogenaamde Flow:
         1. Is de term een curriculumwaarde (@id of inDefinedTermSet), zo niet dan verplaatsen naar schema:keywords.
@@ -279,9 +383,7 @@ def defined_term(target_p, lookupObject):
         """
         results = {"exactMatch": a.get("exactMatch", [])}
         for term in os:
-            is_cur, curriculum_uri = is_curriculum_waarde_in_term(
-                term, inDefinedTermSet
-            )
+            is_cur, curriculum_uri = is_curriculum(term, inDefinedTermSet)
             if is_cur:
                 target = target_p
                 result = copy_walk(term)
@@ -299,12 +401,43 @@ def defined_term(target_p, lookupObject):
             if matches_id:
                 results["exactMatch"].append((target, matches_id))
             results[target].append(result)
-        return a | {k: v for k, v in results.items() if v}
+        a.update((k, v) for k, v in results.items() if v)
+
+    def lookup_requests(s, p, os):
+        for term in os:
+            is_cur, _ = is_curriculum(term, inDefinedTermSet)
+            if is_cur:
+                if termId := term.get("@id"):
+                    yield (
+                        "lookupById",
+                        "urn:edurep:conceptset",
+                        utils.pretty_print_uuid(termId),
+                    )
+            elif "@type" in term:
+                # candidates for improve_keyword, the termCode can come from either key
+                for key in (
+                    schema + "termCode",
+                    schema + "targetName",
+                    schema + "name",
+                ):
+                    for v in term.get(key, []):
+                        if "@value" in v:
+                            yield (
+                                "lookupByValue",
+                                "urn:edurep:conceptset",
+                                v["@value"],
+                            )
 
     defined_term_fn.lookup_info = {
         "urn:edurep:conceptset": {"not_found": to_curie(target_p)}
     }
+    defined_term_fn.lookup_requests = lookup_requests
     return defined_term_fn
 
 
-__all__ = ["defined_term", "improve_keywords", "result_to_defined_term"]
+__all__ = [
+    "defined_term",
+    "improve_keywords",
+    "result_to_defined_term",
+    "CurriculumMatcher",
+]
@@ -25,10 +25,13 @@
 
 from .defined_term import (
     is_curriculum_waarde_in_term,
+    CurriculumMatcher,
+    is_uri,
     add_id_to_defined_term,
     defined_term,
     improve_keywords,
     prep_improve_keyword,
+    result_to_defined_term,
 )
 
 from metastreams.jsonld import ignore_silently, walk
@@ -36,7 +39,10 @@ from .ns import schema, edurep_terms
 from collections import namedtuple
 from contextlib import contextmanager
 
+import itertools
 import pytest
+import random
+import rfc3987
 
 _l = namedtuple(
     "LookupResult",
@@ -92,6 +98,34 @@ def test_is_curriculum_waarde():
     ) == (False, None)
 
 
+def test_curriculum_matcher():
+    is_curriculum = CurriculumMatcher(
+        ["http://example.org/framework", "http://example.org/framework/sub", "urn:x"]
+    )
+    assert is_curriculum({"@id": "http://example.org/framework/sub/1"}) == (
+        True,
+        "http://example.org/framework/sub",
+    )
+    assert is_curriculum({"@id": "http://example.org/framework/s"}) == (
+        True,
+        "http://example.org/framework",
+    )
+    assert is_curriculum({"@id": "http://example.org/framework/sub/"}) == (
+        True,
+        "http://example.org/framework",
+    )
+    assert is_curriculum({"@id": "urn:x:1"}) == (True, "urn:x")
+    assert is_curriculum({"@id": "urn:x:"}) == (False, None)
+    assert is_curriculum({"@id": "my:urn:x:1"}) == (False, None)
+    assert is_curriculum(
+        {"@id": "my:id", schema + "inDefinedTermSet": [{"@value": "urn:x"}]}
+    ) == (True, "urn:x")
+    assert is_curriculum_waarde_in_term(
+        {"@id": "my:http://purl.edustandaard.nl/concept/1"}
+    ) == (False, None)
+    assert CurriculumMatcher([])({"@id": "urn:x:1"}) == (False, None)
+
+
 def test_add_id_to_defined_term():
     assert (
         add_id_to_defined_term(
@@ -143,6 +177,71 @@ def test_add_id_to_defined_term():
     )
 
 
+def iri_corpus():
+    schemes = ["http", "https", "HTTP", "urn", "ftp", "mailto", "1http", "ht tp", ""]
+    separators = ["://", ":", ":/", "//", ""]
+    hosts = [
+        "purl.edustandaard.nl",
+        "",
+        "a b",
+        "user@host",
+        "user:pw@host",
+        "[::1]",
+        "[v1.x]",
+        "host:8080",
+        "host:",
+        "host:80a",
+        "höst",
+        "-",
+        "%41",
+    ]
+    paths = [
+        "",
+        "/",
+        "/begrippenkader/2a1401e9-c223-493b-9b86-78f6993b1a8d",
+        "/vdex_learningresourcetype_czp_20060628.xml",
+        "/a b",
+        "/%20",
+        "/%zz",
+        "/a#b",
+        "/a#b#c",
+        "/a?b?c#d",
+        "?q=1&r=2",
+        "#frag",
+        "/ü",
+        "/a\n",
+        "/{x}",
+        "/a|b",
+        "/~user/",
+        "/a\\b",
+        "/'quoted'",
+        '/"quoted"',
+        "/<a>",
+        "/a^b",
+        "/a`b",
+    ]
+    for scheme, sep, host, path in itertools.product(schemes, separators, hosts, paths):
+        yield f"{scheme}{sep}{host}{path}"
+    rng = random.Random(3987)
+    alphabet = "aZ09:/?#[]@!$&'()*+,;=-._~% \\\"<>{}|^`éü\n\t"
+    for _ in range(5000):
+        yield "".join(
+            rng.choice(alphabet) for _ in range(rng.randrange(12))
+        ) + rng.choice(["", "http://x/", "urn:a"])
+    for _ in range(5000):
+        yield rng.choice(["http://", "https://", "urn:", "x:"]) + "".join(
+            rng.choice(alphabet) for _ in range(rng.randrange(20))
+        )
+
+
+def test_is_uri_conforms_to_rfc3987():
+    corpus = list(iri_corpus())
+    assert len(corpus) > 20000
+    for s in corpus + corpus:
+        assert bool(is_uri(s)) == bool(rfc3987.match(s, rule="absolute_IRI")), repr(s)
+    assert not is_uri(None)
+
+
 class LookupObject:
     def __init__(self):
         self.by_id = {}
@@ -687,6 +786,23 @@ class TestKeywords_flow:
         yield _w, _lookup
         assert len(_lookup.not_found) == nr_not_found
 
+    def test_keyword_added_later(self):
+        def keyword():
+            return {
+                "@type": [schema + "DefinedTerm"],
+                schema + "termCode": [{"@value": "urn:uuid:later"}],
+            }
+
+        with self.convert(0) as (w, lookup):
+            improve_keyword = prep_improve_keyword(lookup)
+            assert improve_keyword(keyword())[0] == schema + "keywords"
+            assert list(w({schema + "keywords": [keyword()]})) == [schema + "keywords"]
+            lookup.by_value["urn:uuid:later"] = lookup.by_value["urn:uuid:master"]
+            assert improve_keyword(keyword())[0] == schema + "educationalLevel"
+            assert list(w({schema + "keywords": [keyword()]})) == [
+                schema + "educationalLevel"
+            ]
+
     def test_keywords_to_teaches(self):
         with self.convert(0) as (w, lookup):
             improve_keyword = prep_improve_keyword(lookup)
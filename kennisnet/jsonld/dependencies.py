@@ -0,0 +1,112 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from array import array
+from contextlib import contextmanager
+from threading import local
+
+
+class RecordingLookup:
+    """Passes lookups to the wrapped lookup object and, within recording(),
+    collects their (method, scheme, value) keys. Every thread records its
+    own lookups."""
+
+    def __init__(self, lookupObject):
+        self.lookupObject = lookupObject
+        self._local = local()
+        if hasattr(lookupObject, "lookupMany"):
+            self.lookupMany = self._lookupMany
+
+    @contextmanager
+    def recording(self):
+        """Yields the set the keys of the lookups made meanwhile are added to."""
+        previous = getattr(self._local, "keys", None)
+        keys = self._local.keys = set()
+        try:
+            yield keys
+        finally:
+            self._local.keys = previous
+
+    def _record(self, key):
+        if (keys := getattr(self._local, "keys", None)) is not None:
+            keys.add(key)
+
+    def lookupById(self, scheme, value):
+        self._record(("lookupById", scheme, value))
+        return self.lookupObject.lookupById(scheme, value)
+
+    def lookupByValue(self, scheme, value):
+        self._record(("lookupByValue", scheme, value))
+        return self.lookupObject.lookupByValue(scheme, value)
+
+    def _lookupMany(self, requests):
+        requests = list(requests)
+        if (keys := getattr(self._local, "keys", None)) is not None:
+            keys.update(requests)
+        return self.lookupObject.lookupMany(requests)
+
+    def __getattr__(self, name):
+        return getattr(self.lookupObject, name)
+
+
+class ReverseIndex:
+    """Maps lookup keys to the records that depend on them, as returned by
+    an enrich prepared with track_dependencies=True. Record ids are stored
+    once and referred to by number. Adding a record again adds its new
+    dependencies without removing the old ones, so records() may return
+    records that no longer depend on a key, never less."""
+
+    def __init__(self):
+        self._record_ids = []
+        self._numbers = {}
+        self._records = {}
+
+    def add(self, record_id, dependencies):
+        number = self._numbers.get(record_id)
+        if number is None:
+            number = self._numbers[record_id] = len(self._record_ids)
+            self._record_ids.append(record_id)
+        for key in dependencies:
+            numbers = self._records.get(key)
+            if numbers is None:
+                numbers = self._records[key] = array("I")
+            if not numbers or numbers[-1] != number:
+                numbers.append(number)
+
+    def records(self, keys):
+        """The ids of the records that depend on any of keys."""
+        numbers = set()
+        for key in keys:
+            numbers.update(self._records.get(key, ()))
+        return {self._record_ids[n] for n in sorted(numbers)}
+
+    def keys(self):
+        return self._records.keys()
+
+    def __len__(self):
+        return len(self._records)
+
+
+__all__ = ["RecordingLookup", "ReverseIndex"]
@@ -0,0 +1,68 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .dependencies import RecordingLookup, ReverseIndex
+from .enrich_test import RecordingMockLookup
+from .lookup import TableLookup
+
+
+def test_recording_lookup():
+    lookup = RecordingLookup(TableLookup({"byValue": {"s": {"a": {"id": "x"}}}}))
+    assert not hasattr(lookup, "lookupMany")
+    assert lookup.lookupByValue("s", "a").id == "x"
+    with lookup.recording() as keys:
+        lookup.lookupByValue("s", "a")
+        lookup.lookupById("s", "x")
+        lookup.lookupByValue("s", "a")
+        with lookup.recording() as inner:
+            lookup.lookupById("s", "y")
+        lookup.report_invalid("schema:name", "a")
+    assert keys == {("lookupByValue", "s", "a"), ("lookupById", "s", "x")}
+    assert inner == {("lookupById", "s", "y")}
+
+    lookup = RecordingLookup(RecordingMockLookup(batch=True))
+    with lookup.recording() as keys:
+        lookup.lookupMany([("lookupById", "s", "x")])
+    assert keys == {("lookupById", "s", "x")}
+
+
+def test_reverse_index():
+    index = ReverseIndex()
+    a, b, c = (
+        ("lookupById", "s", "a"),
+        ("lookupById", "s", "b"),
+        ("lookupById", "s", "c"),
+    )
+    index.add("record:1", {a, b})
+    index.add("record:2", {b})
+    index.add("record:3", set())
+    assert len(index) == 2
+    assert index.records([a]) == {"record:1"}
+    assert index.records([b, c]) == {"record:1", "record:2"}
+    assert index.records([c]) == set()
+    index.add("record:2", {c})
+    assert index.records([c]) == {"record:2"}
+    assert index.records([b]) == {"record:1", "record:2"}
+    assert set(index.keys()) == {a, b, c}
@@ -27,16 +27,20 @@ from metastreams.jsonld import (
     walk,
     identity,
     ignore_silently,
-    tuple2list,
     map_predicate2,
 )
 from .defined_term import (
     defined_term,
     improve_keywords,
-    result_to_defined_term,
     add_id_to_defined_term,
+    result_to_defined_term,
 )
 from .ns import schema, lom, dcterms, edurep_terms, to_curie
+from .lookup import PrefetchLookup, NegativeCache, WarmLookup, lookup_schemes
+from .instrument import RuleStats
+from .dependencies import RecordingLookup
+from .inplace import functional, as_inplace, walk_inplace, compile_walk
+from contextlib import nullcontext
 import kennisnet.jsonld.utils as utils
 
 
@@ -72,6 +76,7 @@ def definition(target_p, lookup, scheme, type, identifier_p):
             new_o["@type"] = [type]
             return new_o
 
+    @functional
     def check_fn(a, s, p, os):
         result = a.get(target_p, [])
         for o in os:
@@ -83,7 +88,7 @@ def definition(target_p, lookup, scheme, type, identifier_p):
             if value:
                 l = lookup.lookupByValue(scheme, value)
             else:
-                l = lookup.lookupById(id)
+                l = lookup.lookupById(scheme, id)
             if l.identifier is None and l.id is None:
                 lookup.report_invalid(to_curie(target_p), value or id)
                 continue
@@ -95,13 +100,30 @@ def definition(target_p, lookup, scheme, type, identifier_p):
         addition = {}
         if result:
             addition[target_p] = result
-        return a | addition
+        a.update(addition)
+
+    def lookup_requests(s, p, os):
+        for o in os:
+            if value := value_fn(o):
+                yield ("lookupByValue", scheme, value)
+            elif id := o.get("@id"):
+                yield ("lookupById", scheme, id)
 
     check_fn.lookup_info = {scheme: {"invalid": to_curie(target_p)}}
+    check_fn.lookup_requests = lookup_requests
     return check_fn
 
 
+def values_lookup_requests(scheme):
+    def lookup_requests(s, p, os):
+        for v in values(os):
+            yield ("lookupByValue", scheme, v)
+
+    return lookup_requests
+
+
 def text(target_p, lookup, scheme):
+    @functional
     def text_fn(a, s, p, os):
         result = a.get(target_p, [])
         for v in values(os):
@@ -110,39 +132,38 @@ def text(target_p, lookup, scheme):
                 result.append({"@value": l.identifier})
             else:
                 lookup.report_invalid(to_curie(target_p), v)
-        return a | {target_p: result}
+        a[target_p] = result
 
     text_fn.lookup_info = {scheme: {"invalid": to_curie(target_p)}}
+    text_fn.lookup_requests = values_lookup_requests(scheme)
     return text_fn
 
 
 def cost(target_p, lookup, scheme):
+    @functional
     def text_fn(a, s, p, os):
         """Dit is een tijdelijk veld om waarde over te nemen uit het lom/cost veld. Waardes worden omgezet naar True of False voor schema:isAccessibleForFree"""
         for v in values(os):
             l = lookup.lookupByValue(scheme, v)
             if l.identifier:
-                return a | {target_p: [{"@value": l.identifier != "yes"}]}
+                a[target_p] = [{"@value": l.identifier != "yes"}]
+                return
             else:
                 lookup.report_invalid(to_curie(target_p), v)
-        return a
 
     text_fn.lookup_info = {scheme: {"invalid": to_curie(target_p)}}
+    text_fn.lookup_requests = values_lookup_requests(scheme)
     return text_fn
 
 
 def license(target_p, lookup, scheme):
 
+    @functional
     def license_fn(a, s, p, os):
         """Op basis van lom:copyrightAndOtherRestrictions wordt een lookup gedaan.
         Bij succesvolle lookup worden de velden lom:copyrightAndOtherRestrictions, schema:license en schema:copyrightNotice gevuld.
         In andere gevallen wordt de huidige data overgenomen"""
-        r_other = a.get(lom + "copyrightAndOtherRestrictions", [])
-        r_notice = a.get(schema + "copyrightNotice", [])
-        r_license = a.get(schema + "license", [])
-        if r_other or r_license or r_notice:
-            # Already a result
-            return a
+        r_other, r_notice, r_license = [], [], []
         for v in values(s.get(lom + "copyrightAndOtherRestrictions", [])):
             l = lookup.lookupByValue(scheme, v)
             if not l.uri:
@@ -168,12 +189,24 @@ def license(target_p, lookup, scheme):
             ]
             if v
         }
-        return a | new
+        a.update(new)
+
+    def lookup_requests(s, p, os):
+        yield from values_lookup_requests(scheme)(
+            s, p, s.get(lom + "copyrightAndOtherRestrictions", [])
+        )
 
     license_fn.lookup_info = {scheme: {"invalid": to_curie(schema + "license")}}
+    license_fn.lookup_requests = lookup_requests
+    license_fn.record_predicates = (
+        schema + "license",
+        schema + "copyrightNotice",
+        lom + "copyrightAndOtherRestrictions",
+    )
     return license_fn
 
 
+@functional
 def is_boolean(a, s, p, os):
     """Valideer dat waardes True of False zijn, waarden als 'yes','no','ja' en 'nee' worden vertaald."""
     result = a.get(p, [])
@@ -192,22 +225,135 @@ def is_boolean(a, s, p, os):
         if not b is None:
             result.append({"@value": b})
     if result:
-        return a | {p: result}
-    return a
+        a[p] = result
 
 
 def normalize_date(os):
     r = (o | {"@value": utils.normalize_datetime(o["@value"])} for o in os)
-    return tuple(o for o in r if not o["@value"] is None)
+    return [o for o in r if not o["@value"] is None]
 
 
-def prepare_enrich(lookupObject=None):
-    info = {}
+def lookup_requests(rules, data):
+    """Yields the (method, scheme, value) lookups the rules will need for data."""
+    default = rules.get("*")
+    seen = []
+    for p, os in data.items():
+        rule = rules.get(p, default)
+        if p in getattr(rule, "record_predicates", ()):
+            if rule in seen:
+                continue
+            seen.append(rule)
+        requests_fn = getattr(rule, "lookup_requests", None)
+        if requests_fn is not None:
+            yield from requests_fn(data, p, os)
+
+
+def split_record_rules(rules):
+    """Splits off the record-level rules: a rule with a record_predicates
+    attribute runs once per record that has any of these predicates, instead
+    of once per predicate. Returns the rules for the walk, which ignores the
+    record predicates, and the list of record rules."""
+    walk_rules, record_rules = {}, []
+    for p, rule in rules.items():
+        if p in getattr(rule, "record_predicates", ()):
+            walk_rules[p] = ignore_silently
+            if rule not in record_rules:
+                record_rules.append(rule)
+        else:
+            walk_rules[p] = rule
+    return walk_rules, record_rules
+
+
+def record_stage(record_rules, inplace=False):
+    """Applies the record rules to the walk result a of record s; the rules are
+    called with p and os None."""
+    record_rules = [
+        (rule.record_predicates, as_inplace(rule) if inplace else rule)
+        for rule in record_rules
+    ]
+
+    def stage(a, s):
+        for predicates, rule in record_rules:
+            if any(p in s for p in predicates):
+                if inplace:
+                    rule(a, s, None, None)
+                else:
+                    a = rule(a, s, None, None)
+        return a
 
+    return stage
+
+
+def prepare_enrich(
+    lookupObject=None,
+    prefetch=False,
+    instrument=False,
+    inplace=False,
+    curriculum_uris=None,
+    track_dependencies=False,
+    compiled=False,
+    check_output=False,
+    negative_cache=0,
+    warm_up=False,
+):
+    """The rules produce lists, dicts and plain values only, so the result is
+    ready for JSON as it is; it shares lists and value dicts with the input
+    record, but not with other results.
+    check_output=True asserts that no tuples end up in the result.
+
+    enrich can be called from several threads at once, one record per
+    thread, if the lookup object allows that (see threaded.enrich_threaded).
+
+    With prefetch=True all lookups a record needs are resolved with one
+    lookupMany call on the lookup object before the rules are applied; use
+    enrich.prefetch(records) to resolve them for a batch of records at once.
+
+    With instrument=True every rule is timed and its lookups are counted;
+    enrich.stats() returns them per predicate curie and enrich.reset_stats()
+    starts over.
+
+    Rules that handle several predicates at once, like license, run once per
+    record after the walk (see split_record_rules).
+
+    curriculum_uris replaces the uris of the curriculum frameworks terms are
+    recognized by (defined_term.curriculum_uris).
+
+    With negative_cache > 0 keyword candidates that matched no typed concept
+    are not looked up again, at most that many of them are kept. A value
+    added to the vocabulary later is then not found by this enrich until
+    enrich.clear_misses() or enrich.warm_up(); track_dependencies=True
+    disables this.
+
+    With track_dependencies=True enrich returns (result, dependencies), the
+    set of (method, scheme, value) keys of the lookups the record needed,
+    exactMatch follow-ups included (see dependencies.ReverseIndex).
+
+    With inplace=True the rules update one accumulator per record (see
+    walk_inplace) instead of copying it for every predicate. compiled=True
+    does the same with a walk specialised for the rules (see compile_walk).
+
+    With warm_up=True every scheme in info is loaded from the lookup
+    object's dumpScheme(scheme) before enrich is returned (see WarmLookup,
+    a lookup object without dumpScheme raises ValueError);
+    enrich.warm_up() loads them again and returns the number of results per
+    scheme."""
+    info = {}
+    if warm_up:
+        warmer = lookupObject = WarmLookup(lookupObject)
+    if prefetch:
+        lookupObject = PrefetchLookup(lookupObject)
+    prefetcher = lookupObject
+    if track_dependencies:
+        recorder = lookupObject = RecordingLookup(lookupObject)
+    if instrument:
+        stats = RuleStats()
+        lookupObject = stats.lookup(lookupObject)
+
+    misses = NegativeCache(0 if track_dependencies else negative_cache)
     license_fn = license(schema + "license", lookupObject, scheme="urn:lms:license")
 
     rules = {
-        schema + "keywords": improve_keywords(lookupObject),
+        schema + "keywords": improve_keywords(lookupObject, misses),
         schema
         + "creativeWorkStatus": text(
             schema + "creativeWorkStatus", lookup=lookupObject, scheme="urn:lms:status"
@@ -247,15 +393,26 @@ def prepare_enrich(lookupObject=None):
         ),
         schema
         + "educationalAlignment": defined_term(
-            schema + "educationalAlignment", lookupObject
+            schema + "educationalAlignment",
+            lookupObject,
+            curriculum_uris,
+            misses,
+        ),
+        schema
+        + "educationalLevel": defined_term(
+            schema + "educationalLevel",
+            lookupObject,
+            curriculum_uris,
+            misses,
         ),
         schema
-        + "educationalLevel": defined_term(schema + "educationalLevel", lookupObject),
-        schema + "teaches": defined_term(schema + "teaches", lookupObject),
+        + "teaches": defined_term(
+            schema + "teaches", lookupObject, curriculum_uris, misses
+        ),
         schema
         + "learningResourceType": map_predicate2(
             schema + "learningResourceType",
-            lambda os: tuple(add_id_to_defined_term(o) for o in os),
+            lambda os: [add_id_to_defined_term(o) for o in os],
         ),
         schema + "license": license_fn,
         schema + "copyrightNotice": license_fn,
@@ -279,22 +436,79 @@ def prepare_enrich(lookupObject=None):
                 lookup_info
             )
 
-    w = walk(rules)
+    walk_rules, record_rules = split_record_rules(rules)
+    if instrument:
+        # the record predicates left to the walk are not timed
+        walk_rules = {
+            k: stats.instrument(k, v) if callable(v) and v is rules[k] else v
+            for k, v in walk_rules.items()
+        }
+        record_rules = [
+            stats.instrument(rule.record_predicates[0], rule) for rule in record_rules
+        ]
+
+    if compiled:
+        w = compile_walk(walk_rules)
+    elif inplace:
+        w = walk_inplace(walk_rules)
+    else:
+        w = walk(walk_rules)
+    stage = record_stage(record_rules, inplace=inplace or compiled)
+
+    def prefetched(requests):
+        if prefetch:
+            return prefetcher.prefetch(requests)
+        return nullcontext()
 
     def enrich(data, dateModified=None):
         dateModified = utils.normalize_datetime(dateModified)
-        result = w(data)
-        for target, matches_id in result.pop("exactMatch", []):
-            terms = result.get(target, [])
-            if any(matches_id == item.get("@id") for item in terms):
-                continue
-            term = result_to_defined_term(
-                lookupObject.lookupById("urn:edurep:conceptset", matches_id), target
-            )
-            result[target] = terms + [term]
+        with prefetched(lookup_requests(rules, data)):
+            result = stage(w(data), data)
+        exactMatch = result.pop("exactMatch", [])
+        with prefetched(
+            ("lookupById", "urn:edurep:conceptset", matches_id)
+            for _, matches_id in exactMatch
+        ):
+            for target, matches_id in exactMatch:
+                terms = result.get(target, [])
+                if any(matches_id == item.get("@id") for item in terms):
+                    continue
+                term = result_to_defined_term(
+                    lookupObject.lookupById("urn:edurep:conceptset", matches_id),
+                    target,
+                )
+                result[target] = terms + [term]
         if dateModified and result.get(schema + "dateModified") is None:
             result[schema + "dateModified"] = [{"@value": dateModified}]
-        return tuple2list(result)
+        if check_output and (path := utils.find_tuple(result)) is not None:
+            raise AssertionError(f"Tuple in enrich result at {path}")
+        return result
+
+    if track_dependencies:
+        enrich_only = enrich
+
+        def enrich(data, dateModified=None):
+            with recorder.recording() as dependencies:
+                result = enrich_only(data, dateModified)
+            return result, dependencies
+
+    enrich.lookup_requests = lambda data: lookup_requests(rules, data)
+    if instrument:
+        enrich.stats = stats.as_dict
+        enrich.reset_stats = stats.reset
+    enrich.clear_misses = misses.clear
+    if warm_up:
+
+        def warm_up_again():
+            misses.clear()
+            return warmer.warm_up(lookup_schemes(info))
+
+        enrich.warm_up = warm_up_again
+        enrich.warm_up()
+    if prefetch:
+        enrich.prefetch = lambda records: prefetched(
+            r for data in records for r in lookup_requests(rules, data)
+        )
 
     return enrich, info
 
@@ -0,0 +1,101 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from .lookup import LookupResult
+import asyncio
+import inspect
+
+
+class ReplayLookup:
+    """Answers lookups from results resolved beforehand. Unresolved lookups are
+    recorded as missing and answered with an empty result; reports are kept
+    until the caller knows the run was complete."""
+
+    def __init__(self):
+        self.replay({})
+
+    def replay(self, results):
+        self.results = results
+        self.missing = {}
+        self.reports = []
+
+    def report_invalid(self, key, value):
+        self.reports.append(("report_invalid", key, value))
+
+    def report_not_found(self, key, value):
+        self.reports.append(("report_not_found", key, value))
+
+    def lookupById(self, scheme, value):
+        return self._get(("lookupById", scheme, value))
+
+    def lookupByValue(self, scheme, value):
+        return self._get(("lookupByValue", scheme, value))
+
+    def _get(self, request):
+        try:
+            return self.results[request]
+        except KeyError:
+            self.missing[request] = None
+            return LookupResult()
+
+
+def prepare_enrich_async(lookupObject=None):
+    """Like prepare_enrich, for a lookup object with async lookupByValue and
+    lookupById methods. The lookups of a record are issued concurrently, then
+    the rules run on the results. Lookups that only show up while running the
+    rules (like exactMatch) are resolved and the rules are run again, until
+    nothing is missing, so the output is the same as with prepare_enrich."""
+    replay = ReplayLookup()
+    enrich_sync, info = prepare_enrich(replay)
+
+    async def resolve(requests):
+        requests = list(requests)
+        results = await asyncio.gather(
+            *(
+                getattr(lookupObject, method)(scheme, value)
+                for method, scheme, value in requests
+            )
+        )
+        return dict(zip(requests, results))
+
+    async def enrich(data, dateModified=None):
+        results = await resolve(dict.fromkeys(enrich_sync.lookup_requests(data)))
+        while True:
+            replay.replay(results)
+            result = enrich_sync(data, dateModified)
+            missing, reports = replay.missing, replay.reports
+            if not missing:
+                break
+            results = results | await resolve(missing)
+        for method, key, value in reports:
+            if inspect.isawaitable(r := getattr(lookupObject, method)(key, value)):
+                await r
+        return result
+
+    return enrich, info
+
+
+__all__ = ["prepare_enrich_async"]
@@ -0,0 +1,136 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from .enrich_async import prepare_enrich_async
+from .enrich_test import MockLookup, RecordingMockLookup, example, prefetch_example
+
+from copy import deepcopy
+import asyncio
+import pytest
+
+
+class AsyncMockLookup:
+    def __init__(self):
+        self.lookup = RecordingMockLookup()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def report_invalid(self, key, value):
+        self.lookup.report_invalid(key, value)
+
+    async def report_not_found(self, key, value):
+        self.lookup.report_not_found(key, value)
+
+    async def _lookup(self, method, scheme, value):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return getattr(self.lookup, method)(scheme, value)
+
+    async def lookupById(self, scheme, value):
+        return await self._lookup("lookupById", scheme, value)
+
+    async def lookupByValue(self, scheme, value):
+        return await self._lookup("lookupByValue", scheme, value)
+
+
+records = [
+    lambda: prefetch_example(),
+    lambda: example(
+        {
+            "schema:educationalLevel": [
+                {"@id": "uri:has_match"},
+                {
+                    "@type": "schema:DefinedTerm",
+                    "schema:inDefinedTermSet": "http://purl.edustandaard.nl/begrippenkader",
+                    "@id": "http://purl.edustandaard.nl/begrippenkader/some:unknown:id",
+                },
+                {
+                    "@type": "schema:DefinedTerm",
+                    "schema:name": {"@language": "nl", "@value": "VO"},
+                },
+            ],
+            "schema:keywords": [
+                "aap",
+                {"@type": "schema:DefinedTerm", "schema:termCode": "VO"},
+                {"@type": "schema:DefinedTerm", "schema:termCode": "noot"},
+            ],
+            "schema:audience": ["learnerrr", "wrong"],
+        }
+    )[0],
+    lambda: example(
+        {
+            "lom:copyrightAndOtherRestrictions": "some unresolvable text",
+            "schema:copyrightNotice": "Notice stays",
+            "lom:cost": "ja",
+            "schema:dateModified": "2019-01-10T00:11:22+00:00",
+        }
+    )[0],
+]
+
+
+@pytest.mark.parametrize("record", records)
+def test_same_as_sync(record):
+    sync_lookup = MockLookup()
+    expected = prepare_enrich(sync_lookup)[0](record(), "2023-01-10")
+
+    lookup = AsyncMockLookup()
+    enrich, info = prepare_enrich_async(lookup)
+    assert asyncio.run(enrich(record(), "2023-01-10")) == expected
+    assert info == prepare_enrich(MockLookup())[1]
+    assert lookup.lookup.invalid == sync_lookup.invalid
+    assert lookup.lookup.not_found == sync_lookup.not_found
+
+
+def test_lookups_are_concurrent():
+    lookup = AsyncMockLookup()
+    enrich = prepare_enrich_async(lookup)[0]
+    asyncio.run(enrich(records[1]()))
+    assert lookup.max_in_flight > 1
+
+
+def test_concurrent_records():
+    lookup = AsyncMockLookup()
+    enrich = prepare_enrich_async(lookup)[0]
+
+    async def enrich_all():
+        return await asyncio.gather(*(enrich(record()) for record in records))
+
+    sync_enrich = prepare_enrich(MockLookup())[0]
+    assert asyncio.run(enrich_all()) == [sync_enrich(record()) for record in records]
+
+
+def test_same_lookups_as_sync():
+    record = example(
+        {"schema:keywords": {"@type": "schema:DefinedTerm", "schema:name": "VO"}}
+    )[0]
+    sync_lookup = RecordingMockLookup()
+    prepare_enrich(sync_lookup)[0](deepcopy(record))
+    lookup = AsyncMockLookup()
+    asyncio.run(prepare_enrich_async(lookup)[0](deepcopy(record)))
+    assert sync_lookup.calls == [("lookupByValue", "urn:edurep:conceptset", "VO")]
+    assert lookup.lookup.calls == sync_lookup.calls
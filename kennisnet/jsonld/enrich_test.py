@@ -24,11 +24,14 @@
 ## end license ##
 
 from .enrich import prepare_enrich, definition
+from .lookup import CachingLookup, lookup_schemes
+from .persistent import PersistentLookup
 
 from collections import namedtuple
 from .utils import anything
 from .ns import edurep_terms, schema, lom, dcterms
 from contextlib import contextmanager
+from copy import deepcopy
 from pyld import jsonld
 
 import pytest
@@ -133,6 +136,42 @@ class MockLookup:
         return self.by_value.get(scheme, {}).get(value, _l())
 
 
+class RecordingMockLookup(MockLookup):
+    """MockLookup that records its lookups in calls and the schemes it dumps
+    in dumped. With batch=True it has lookupMany, which records the requests
+    of each call in batches."""
+
+    def __init__(self, batch=False):
+        super().__init__()
+        self.calls = []
+        self.batches = []
+        self.dumped = []
+        if batch:
+            self.lookupMany = self._lookupMany
+
+    def lookupById(self, scheme, value):
+        self.calls.append(("lookupById", scheme, value))
+        return super().lookupById(scheme, value)
+
+    def lookupByValue(self, scheme, value):
+        self.calls.append(("lookupByValue", scheme, value))
+        return super().lookupByValue(scheme, value)
+
+    def _lookupMany(self, requests):
+        self.batches.append(list(requests))
+        return {
+            (method, scheme, value): getattr(MockLookup, method)(self, scheme, value)
+            for method, scheme, value in requests
+        }
+
+    def dumpScheme(self, scheme):
+        self.dumped.append(scheme)
+        return {
+            "byValue": self.by_value.get(scheme, {}),
+            "byId": self.by_id.get(scheme, {}),
+        }
+
+
 def example(d):
     return jsonld.expand(
         {
@@ -144,10 +183,40 @@ def example(d):
     )
 
 
+# every enricher in the tests below is compared with these variants
+variants = [
+    dict(check_output=True),
+    dict(inplace=True, check_output=True),
+    dict(compiled=True, check_output=True),
+]
+
+
 @contextmanager
 def enrich_and_lookup(nr_invalid=0, nr_not_found=0):
     lookup = MockLookup()
-    yield prepare_enrich(lookup)[0], lookup
+    enrich = prepare_enrich(lookup)[0]
+    others = []
+    for kwargs in variants:
+        other_lookup = MockLookup()
+        others.append((prepare_enrich(other_lookup, **kwargs)[0], other_lookup))
+
+    def reports(lookup):
+        return len(lookup.invalid), len(lookup.not_found)
+
+    def enrich_and_compare(data, *args, **kwargs):
+        copies = [deepcopy(data) for _ in others]
+        invalid, not_found = reports(lookup)
+        result = enrich(data, *args, **kwargs)
+        for (other, other_lookup), other_data in zip(others, copies):
+            other_invalid, other_not_found = reports(other_lookup)
+            assert other(other_data, *args, **kwargs) == result
+            assert other_lookup.invalid[other_invalid:] == lookup.invalid[invalid:]
+            assert (
+                other_lookup.not_found[other_not_found:] == lookup.not_found[not_found:]
+            )
+        return result
+
+    yield enrich_and_compare, lookup
     assert len(lookup.invalid) == nr_invalid
     assert len(lookup.not_found) == nr_not_found
 
@@ -288,6 +357,105 @@ def test_educationallevel_by_id():
         )
 
 
+def test_curriculum_uris():
+    i = example({"schema:educationalLevel": {"@id": "urn:framework:vo"}})
+    enricher = prepare_enrich(MockLookup())[0]
+    assert (
+        enricher(i[0]) == example({"schema:keywords": {"@id": "urn:framework:vo"}})[0]
+    )
+
+    lookup = MockLookup()
+    enricher = prepare_enrich(lookup, curriculum_uris={"urn:framework"})[0]
+    assert (
+        enricher(i[0])
+        == example(
+            {
+                "schema:educationalLevel": {
+                    "@id": "urn:framework:vo",
+                    "@type": "schema:DefinedTerm",
+                    "schema:inDefinedTermSet": "urn:framework",
+                }
+            }
+        )[0]
+    )
+    assert lookup.not_found == [("schema:educationalLevel", "urn:framework:vo")]
+
+
+def test_track_dependencies():
+    enricher = prepare_enrich(MockLookup(), track_dependencies=True)[0]
+    i = example(
+        {
+            "schema:creativeWorkStatus": "definitief",
+            "schema:educationalLevel": {
+                "@id": "uri:has_match",
+                "@type": "schema:DefinedTerm",
+                "schema:inDefinedTermSet": "http://purl.edustandaard.nl/begrippenkader",
+            },
+        }
+    )
+    result, dependencies = enricher(i[0])
+    assert result == prepare_enrich(MockLookup())[0](i[0])
+    assert dependencies == {
+        ("lookupByValue", "urn:lms:status", "definitief"),
+        ("lookupById", "urn:edurep:conceptset", "uri:has_match"),
+        ("lookupById", "urn:edurep:conceptset", "uri:matches"),
+    }
+    assert enricher(example({})[0]) == (example({})[0], set())
+
+
+def test_warm_up():
+    lookup = RecordingMockLookup()
+    enricher, info = prepare_enrich(lookup, warm_up=True)
+    assert lookup.dumped == lookup_schemes(info)
+    assert {"urn:lms:status", "urn:edurep:conceptset"} <= set(lookup.dumped)
+    i = example(
+        {
+            "schema:creativeWorkStatus": "definitief",
+            "schema:encodingFormat": "text/nonsense",
+            "schema:educationalLevel": {"@id": "uri:has_match"},
+        }
+    )
+    assert enricher(i[0]) == prepare_enrich(MockLookup())[0](i[0])
+    assert lookup.calls == [("lookupByValue", "urn:lms:mimetype", "text/nonsense")]
+    assert enricher.warm_up()["urn:lms:status"] == 1
+
+
+def test_warm_up_through_wrappers(tmp_path):
+    lookup = RecordingMockLookup()
+    persistent = PersistentLookup(lookup, str(tmp_path / "lookups.sqlite"), "v1")
+    with persistent:
+        enricher, info = prepare_enrich(CachingLookup(persistent), warm_up=True)
+        assert lookup.dumped == lookup_schemes(info)
+    with pytest.raises(ValueError):
+        prepare_enrich(CachingLookup(MockLookup()), warm_up=True)
+
+
+def test_negative_cache_cleared():
+    record = example(
+        {"schema:keywords": {"@type": "schema:DefinedTerm", "schema:termCode": "VWO"}}
+    )[0]
+    lookup = RecordingMockLookup()
+    enricher = prepare_enrich(lookup, warm_up=True, negative_cache=10)[0]
+    assert schema + "educationalLevel" not in enricher(deepcopy(record))
+    conceptset = lookup.by_value["urn:edurep:conceptset"]
+    lookup.by_value["urn:edurep:conceptset"] = conceptset | {
+        "VWO": conceptset["VO"]._replace(id="uri:vwo", labels=[("VWO", "nl")])
+    }
+    assert schema + "educationalLevel" not in enricher(deepcopy(record))
+    assert schema + "educationalLevel" in prepare_enrich(lookup)[0](deepcopy(record))
+    enricher.clear_misses()
+    assert schema + "educationalLevel" in enricher(deepcopy(record))
+
+    lookup = RecordingMockLookup()
+    enricher = prepare_enrich(lookup, warm_up=True, negative_cache=10)[0]
+    enricher(deepcopy(record))
+    lookup.by_value["urn:edurep:conceptset"] = conceptset | {
+        "VWO": conceptset["VO"]._replace(id="uri:vwo", labels=[("VWO", "nl")])
+    }
+    enricher.warm_up()
+    assert schema + "educationalLevel" in enricher(deepcopy(record))
+
+
 def test_educationallevel_copy():
     with enrich_and_lookup(0, 1) as (enricher, lookup):
         i = example(
@@ -694,6 +862,35 @@ def test_license():
         assert lookup.invalid == [("schema:license", "some unresolvable text")]
 
 
+def test_license_once_per_record():
+    lookup = RecordingMockLookup()
+    enricher = prepare_enrich(lookup, instrument=True)[0]
+    i = example(
+        {
+            "lom:copyrightAndOtherRestrictions": ["cc-by-40", "unknown"],
+            "schema:copyrightNotice": "Notice",
+            "schema:license": "http://example.org/license",
+        }
+    )
+    result = enricher(i[0])
+    assert result[schema + "license"] == [
+        {"@value": "http://creativecommons.org/licenses/by/4.0/"}
+    ]
+    assert lookup.calls == [
+        ("lookupByValue", "urn:lms:license", "cc-by-40"),
+        ("lookupByValue", "urn:lms:license", "unknown"),
+        ("lookupById", "urn:lms:license", "unknown"),
+    ]
+    assert lookup.invalid == [("schema:license", "unknown")]
+    stats = enricher.stats()
+    assert stats["schema:license"]["calls"] == 1
+    assert "schema:copyrightNotice" not in stats
+    assert list(enricher.lookup_requests(i[0])) == [
+        ("lookupByValue", "urn:lms:license", "cc-by-40"),
+        ("lookupByValue", "urn:lms:license", "unknown"),
+    ]
+
+
 def test_learningResourceType():
     with enrich_and_lookup() as (enricher, lookup):
         i = example(
@@ -816,6 +1013,191 @@ def test_enrich_info():
     }
 
 
+def prefetch_example():
+    return example(
+        {
+            "schema:creativeWorkStatus": "definitief",
+            "schema:encodingFormat": "text/html",
+            "schema:audience": "learnerrr",
+            "schema:educationalLevel": {
+                "@id": "uri:has_match",
+                "@type": "schema:DefinedTerm",
+                "schema:inDefinedTermSet": "http://purl.edustandaard.nl/begrippenkader",
+            },
+            "schema:keywords": {"@type": "schema:DefinedTerm", "schema:termCode": "VO"},
+            "lom:copyrightAndOtherRestrictions": "cc-by-40",
+        }
+    )[0]
+
+
+def test_prefetch():
+    expected = prepare_enrich(MockLookup())[0](prefetch_example())
+    lookup = RecordingMockLookup(batch=True)
+    enricher = prepare_enrich(lookup, prefetch=True)[0]
+    assert enricher(prefetch_example()) == expected
+    assert len(lookup.batches) == 2
+    assert set(lookup.batches[0]) == {
+        ("lookupByValue", "urn:lms:status", "definitief"),
+        ("lookupByValue", "urn:lms:mimetype", "text/html"),
+        ("lookupByValue", "urn:lms:intendedenduserrole", "learnerrr"),
+        ("lookupById", "urn:edurep:conceptset", "uri:has_match"),
+        ("lookupByValue", "urn:edurep:conceptset", "VO"),
+        ("lookupByValue", "urn:lms:license", "cc-by-40"),
+    }
+    assert lookup.batches[1] == [("lookupById", "urn:edurep:conceptset", "uri:matches")]
+    assert lookup.calls == []
+    assert lookup.invalid == [("schema:encodingFormat", "text/html")]
+
+
+def test_prefetch_without_lookupMany():
+    expected = prepare_enrich(MockLookup())[0](prefetch_example())
+    lookup = MockLookup()
+    enricher = prepare_enrich(lookup, prefetch=True)[0]
+    assert enricher(prefetch_example()) == expected
+    assert lookup.invalid == [("schema:encodingFormat", "text/html")]
+
+
+def test_prefetch_batch_of_records():
+    lookup = RecordingMockLookup(batch=True)
+    enricher = prepare_enrich(lookup, prefetch=True)[0]
+    records = [
+        example({"schema:creativeWorkStatus": "definitief"})[0],
+        example({"schema:audience": "learnerrr", "lom:cost": "ja"})[0],
+    ]
+    with enricher.prefetch(records):
+        results = [enricher(record) for record in records]
+    assert results == [
+        example({"schema:creativeWorkStatus": "final"})[0],
+        example(
+            {
+                "schema:audience": {
+                    "schema:audienceType": "learner",
+                    "@type": "schema:Audience",
+                    "@id": "http://purl.edustandaard.nl/vdex_intendedenduserrole_lomv1p0_20060628.xml#learner",
+                },
+                "schema:isAccessibleForFree": False,
+            }
+        )[0],
+    ]
+    assert len(lookup.batches) == 1
+    assert set(lookup.batches[0]) == {
+        ("lookupByValue", "urn:lms:status", "definitief"),
+        ("lookupByValue", "urn:lms:intendedenduserrole", "learnerrr"),
+        ("lookupByValue", "urn:lms:cost", "ja"),
+    }
+    assert lookup.calls == []
+
+
+def test_keyword_candidates():
+    records = [
+        example(
+            {
+                "schema:keywords": {
+                    "@type": "schema:DefinedTerm",
+                    "schema:termCode": "onbekend",
+                    "schema:name": ["VO", "onbekend"],
+                }
+            }
+        )[0],
+        example(
+            {
+                "schema:keywords": {
+                    "@type": "schema:DefinedTerm",
+                    "schema:termCode": "onbekend",
+                }
+            }
+        )[0],
+    ]
+    enrich = prepare_enrich(MockLookup())[0]
+    expected = [enrich(record) for record in records]
+    assert expected[0][schema + "educationalLevel"][0]["@id"] == (
+        "http://purl.edustandaard.nl/begrippenkader/2a1401e9-c223-493b-9b86-78f6993b1a8d"
+    )
+
+    lookup = RecordingMockLookup(batch=True)
+    enricher = prepare_enrich(lookup, negative_cache=10)[0]
+    assert [enricher(record) for record in records] == expected
+    assert lookup.batches == [
+        [
+            ("lookupByValue", "urn:edurep:conceptset", "onbekend"),
+            ("lookupByValue", "urn:edurep:conceptset", "VO"),
+        ]
+    ]
+    assert lookup.calls == []
+
+
+def test_keyword_candidates_cached():
+    record = example(
+        {
+            "schema:keywords": {
+                "@type": "schema:DefinedTerm",
+                "schema:termCode": "VO",
+                "schema:name": ["a", "b", "c"],
+            }
+        }
+    )[0]
+    lookup = RecordingMockLookup()
+    enricher = prepare_enrich(CachingLookup(lookup))[0]
+    assert enricher(deepcopy(record)) == prepare_enrich(MockLookup())[0](record)
+    assert lookup.calls == [("lookupByValue", "urn:edurep:conceptset", "VO")]
+
+
+def test_results_can_be_changed():
+    record = example(
+        {
+            "schema:keywords": {"@type": "schema:DefinedTerm", "schema:termCode": "VO"},
+            "schema:educationalLevel": {"@id": "uri:has_match"},
+        }
+    )[0]
+    expected = prepare_enrich(MockLookup())[0](deepcopy(record))
+    for kwargs in [{}] + variants:
+        enricher = prepare_enrich(MockLookup(), **kwargs)[0]
+        first = enricher(deepcopy(record))
+        for term in first[schema + "educationalLevel"]:
+            for value in term.get(schema + "name", []):
+                value["@value"] = "CHANGED"
+        assert enricher(deepcopy(record)) == expected
+
+
+def test_instrument():
+    lookup = MockLookup()
+    enricher = prepare_enrich(lookup, instrument=True)[0]
+    assert enricher.stats() == {}
+    i = example(
+        {
+            "schema:creativeWorkStatus": "definitief",
+            "schema:encodingFormat": ["text/html", "application/pdf"],
+            "schema:educationalLevel": {"@id": "uri:has_match"},
+        }
+    )
+    assert enricher(i[0]) == prepare_enrich(MockLookup())[0](i[0])
+    stats = enricher.stats()
+    assert stats["schema:creativeWorkStatus"] == {
+        "calls": 1,
+        "time": anything,
+        "max_time": anything,
+        "lookups": 1,
+    }
+    assert stats["schema:encodingFormat"]["lookups"] == 2
+    assert stats["schema:educationalLevel"]["calls"] == 1
+    assert stats["*"]["lookups"] == 0
+    assert (
+        stats["schema:encodingFormat"]["time"]
+        >= stats["schema:encodingFormat"]["max_time"]
+        > 0
+    )
+
+    enricher(i[0])
+    assert enricher.stats()["schema:creativeWorkStatus"]["calls"] == 2
+    enricher.reset_stats()
+    assert enricher.stats() == {}
+
+
+def test_not_instrumented():
+    enricher = prepare_enrich(MockLookup())[0]
+    assert not hasattr(enricher, "stats")
+
+
 # Testdata is added from examples found in real life data.
 # Data is changed so it is not related to a real life example
 
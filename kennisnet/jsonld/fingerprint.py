@@ -0,0 +1,125 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from hashlib import sha256
+import json
+import sqlite3
+
+SKIP = "skip"
+
+
+def fingerprint(data, version="", dateModified=None):
+    """Hash of the canonical JSON of an input record, the vocabulary version
+    and the dateModified enrich is called with."""
+    canonical = json.dumps(
+        [version, dateModified, data],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def fingerprinted(enrich, store=None, version="", skip=False):
+    """Wraps enrich so records it has seen before, with the same vocabulary
+    version, are not enriched again. The store maps fingerprints to the JSON
+    of the enriched records, it can be a dict, a dbm database or a
+    SqliteStore. With skip=True only the fingerprints are stored and SKIP is
+    returned for records seen before. A record that is not enriched again
+    does not report invalid or not found values again either.
+
+    stats() returns the hits, misses and hit rate."""
+    store = {} if store is None else store
+    counts = {"hits": 0, "misses": 0}
+
+    def enrich_fingerprinted(data, dateModified=None):
+        key = fingerprint(data, version, dateModified)
+        stored = store.get(key)
+        if stored is not None:
+            counts["hits"] += 1
+            return SKIP if skip else json.loads(stored)
+        counts["misses"] += 1
+        result = enrich(data, dateModified)
+        store[key] = "" if skip else json.dumps(result, separators=(",", ":"))
+        return result
+
+    def stats():
+        total = counts["hits"] + counts["misses"]
+        return counts | {"hit_rate": counts["hits"] / total if total else 0.0}
+
+    def reset_stats():
+        counts.update(hits=0, misses=0)
+
+    enrich_fingerprinted.stats = stats
+    enrich_fingerprinted.reset_stats = reset_stats
+    return enrich_fingerprinted
+
+
+class SqliteStore:
+    """Fingerprint store in a sqlite database; writes are committed every
+    commit_every writes and on commit() or close()."""
+
+    def __init__(self, path, commit_every=1000):
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.commit_every = commit_every
+        self._pending = 0
+
+    def get(self, key, default=None):
+        row = self._db.execute(
+            "SELECT value FROM fingerprints WHERE key = ?", (key,)
+        ).fetchone()
+        return default if row is None else row[0]
+
+    def __setitem__(self, key, value):
+        self._db.execute(
+            "INSERT OR REPLACE INTO fingerprints (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def commit(self):
+        self._db.commit()
+        self._pending = 0
+
+    def close(self):
+        self.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+__all__ = ["fingerprint", "fingerprinted", "SqliteStore", "SKIP"]
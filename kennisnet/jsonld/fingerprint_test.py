@@ -0,0 +1,93 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .fingerprint import fingerprint, fingerprinted, SqliteStore, SKIP
+
+import dbm
+import pytest
+
+
+def record(name):
+    return {"@id": "some:id", "http://schema.org/name": [{"@value": name}]}
+
+
+class Enrich:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, data, dateModified=None):
+        self.calls.append(data)
+        return data | {"http://schema.org/dateModified": [{"@value": dateModified}]}
+
+
+def test_fingerprint():
+    assert fingerprint(record("a")) == fingerprint(dict(reversed(record("a").items())))
+    assert fingerprint(record("a")) != fingerprint(record("b"))
+    assert fingerprint(record("a"), "v1") != fingerprint(record("a"), "v2")
+    assert fingerprint(record("a")) != fingerprint(record("a"), dateModified="2024")
+
+
+@pytest.mark.parametrize("kind", ["dict", "dbm", "sqlite"])
+def test_fingerprinted(tmp_path, kind):
+    store = {
+        "dict": lambda: {},
+        "dbm": lambda: dbm.open(str(tmp_path / "fingerprints.dbm"), "c"),
+        "sqlite": lambda: SqliteStore(str(tmp_path / "fingerprints.sqlite")),
+    }[kind]()
+    enrich = Enrich()
+    enricher = fingerprinted(enrich, store, version="v1")
+    first = enricher(record("a"), "2024-01-01")
+    assert enricher(record("a"), "2024-01-01") == first
+    assert enricher(record("b"), "2024-01-01") == enrich(record("b"), "2024-01-01")
+    assert len(enrich.calls) == 3
+    assert enricher.stats() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+    enricher.reset_stats()
+    assert enricher.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+    enricher = fingerprinted(enrich, store, version="v2")
+    assert enricher(record("a"), "2024-01-01") == first
+    assert enricher.stats()["misses"] == 1
+    if kind != "dict":
+        store.close()
+
+
+def test_skip():
+    enrich = Enrich()
+    enricher = fingerprinted(enrich, skip=True)
+    assert enricher(record("a")) == enrich(record("a"))
+    assert enricher(record("a")) is SKIP
+    assert len(enrich.calls) == 2
+
+
+def test_sqlite_store_persists(tmp_path):
+    path = str(tmp_path / "fingerprints.sqlite")
+    with SqliteStore(path, commit_every=2) as store:
+        store["a"] = "1"
+        store["b"] = "2"
+        store["c"] = "3"
+    with SqliteStore(path) as store:
+        assert len(store) == 3
+        assert store.get("c") == "3"
+        assert store.get("d") is None
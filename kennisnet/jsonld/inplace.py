@@ -0,0 +1,149 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from metastreams.jsonld import identity, ignore_silently
+from functools import update_wrapper
+
+
+def functional(inplace_rule):
+    """Turns an in-place rule, that updates the accumulator a and returns
+    nothing or a, into a functional (a, s, p, os) -> a rule that leaves its
+    accumulator alone. The in-place rule stays available as rule.inplace."""
+
+    def rule(a, s, p, os):
+        a = dict(a)
+        inplace_rule(a, s, p, os)
+        return a
+
+    update_wrapper(rule, inplace_rule)
+    rule.inplace = inplace_rule
+    return rule
+
+
+def _identity(a, s, p, os):
+    a[p] = os
+
+
+def _ignore(a, s, p, os):
+    pass
+
+
+def as_inplace(rule):
+    """The in-place version of a rule; functional rules are adapted by copying
+    their result back into the accumulator."""
+    if rule is identity:
+        return _identity
+    if rule is ignore_silently:
+        return _ignore
+    if inplace_rule := getattr(rule, "inplace", None):
+        return inplace_rule
+
+    def adapted(a, s, p, os):
+        r = rule(a, s, p, os)
+        if r is not a:
+            for k in a.keys() - r.keys():
+                del a[k]
+            a.update(r)
+
+    return adapted
+
+
+def walk_inplace(rules):
+    """Like metastreams.jsonld.walk, but with one accumulator per record that
+    in-place rules update instead of copying it for every predicate. Rules
+    must be callables; predicates without a rule (and no "*") are skipped."""
+    rules = {p: as_inplace(rule) for p, rule in rules.items()}
+    default = rules.get("*", _ignore)
+
+    def w(s):
+        a = {}
+        for p, os in s.items():
+            rules.get(p, default)(a, s, p, os)
+        return a
+
+    return w
+
+
+def compile_walk(rules):
+    """Same as walk_inplace(rules), specialised once for the rules table:
+    predicates for identity are stored and predicates for ignore_silently
+    skipped without calling a rule, and the "*" rule is resolved up front.
+    Identity values are stored in the order of the record, like walk does,
+    because a rule may add to a predicate identity also copies."""
+    calls = {}
+    copied, ignored = set(), set()
+    for p, rule in rules.items():
+        if p == "*":
+            continue
+        if rule is identity:
+            copied.add(p)
+        elif rule is ignore_silently:
+            ignored.add(p)
+        else:
+            calls[p] = as_inplace(rule)
+    copied, ignored = frozenset(copied), frozenset(ignored)
+    default = rules.get("*", ignore_silently)
+    calls_get = calls.get
+
+    if default is identity:
+
+        def w(s):
+            a = {}
+            for p, os in s.items():
+                if (rule := calls_get(p)) is not None:
+                    rule(a, s, p, os)
+                elif p not in ignored:
+                    a[p] = os
+            return a
+
+    elif default is ignore_silently:
+
+        def w(s):
+            a = {}
+            for p, os in s.items():
+                if (rule := calls_get(p)) is not None:
+                    rule(a, s, p, os)
+                elif p in copied:
+                    a[p] = os
+            return a
+
+    else:
+        default = as_inplace(default)
+
+        def w(s):
+            a = {}
+            for p, os in s.items():
+                if (rule := calls_get(p)) is not None:
+                    rule(a, s, p, os)
+                elif p in copied:
+                    a[p] = os
+                elif p not in ignored:
+                    default(a, s, p, os)
+            return a
+
+    return w
+
+
+__all__ = ["functional", "as_inplace", "walk_inplace", "compile_walk"]
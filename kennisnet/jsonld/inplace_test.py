@@ -0,0 +1,100 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .inplace import functional, as_inplace, walk_inplace, compile_walk
+from metastreams.jsonld import identity, ignore_silently, walk
+
+
+@functional
+def count(a, s, p, os):
+    """Counts values"""
+    a["count"] = a.get("count", 0) + len(os)
+
+
+def test_functional():
+    a = {"count": 1}
+    assert count(a, {}, "p", [1, 2]) == {"count": 3}
+    assert a == {"count": 1}
+    assert count.__doc__ == "Counts values"
+    count.inplace(a, {}, "p", [1, 2])
+    assert a == {"count": 3}
+
+
+def test_as_inplace():
+    def functional_rule(a, s, p, os):
+        return {k: v for k, v in a.items() if k != "remove"} | {p: os}
+
+    a = {"remove": 1, "keep": 2}
+    as_inplace(functional_rule)(a, {}, "p", [1])
+    assert a == {"keep": 2, "p": [1]}
+    as_inplace(identity)(a, {}, "q", [2])
+    assert a == {"keep": 2, "p": [1], "q": [2]}
+    as_inplace(ignore_silently)(a, {}, "r", [3])
+    assert a == {"keep": 2, "p": [1], "q": [2]}
+    assert as_inplace(count) is count.inplace
+
+
+def test_walk_inplace():
+    rules = {
+        "a": count,
+        "b": count,
+        "c": lambda a, s, p, os: a | {"c": [len(os)]},
+        "d": ignore_silently,
+        "*": identity,
+    }
+    s = {"a": [1, 2], "b": [3], "c": [4, 5, 6], "d": [7], "e": [8]}
+    assert (
+        walk_inplace(rules)(s)
+        == walk(rules)(s)
+        == {
+            "count": 3,
+            "c": [3],
+            "e": [8],
+        }
+    )
+    del rules["*"]
+    assert walk_inplace(rules)({"e": [8]}) == {}
+
+
+def test_compile_walk():
+    rules = {
+        "a": count,
+        "b": count,
+        "c": lambda a, s, p, os: a | {"c": [len(os)]},
+        "d": ignore_silently,
+        "e": identity,
+    }
+    s = {"a": [1, 2], "b": [3], "c": [4, 5, 6], "d": [7], "e": [8], "f": [9]}
+    for default in [identity, ignore_silently, count, None]:
+        table = rules if default is None else rules | {"*": default}
+        assert compile_walk(table)(s) == walk_inplace(table)(s)
+        if default is not None:
+            assert compile_walk(table)(s) == walk(table)(s)
+    assert compile_walk(rules | {"*": identity})(s) == {
+        "count": 3,
+        "c": [3],
+        "e": [8],
+        "f": [9],
+    }
@@ -0,0 +1,130 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .ns import to_curie
+from .inplace import as_inplace
+from functools import update_wrapper
+from threading import Lock, local
+from time import perf_counter
+
+
+class RuleStats:
+    """Call counts, cumulative and max wall time (seconds) and number of lookups
+    per predicate for rules wrapped with instrument(p, rule). Lookups made
+    through lookup(lookupObject) are counted for the rule running at the
+    time in the same thread, other lookups under None."""
+
+    def __init__(self):
+        self._local = local()
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    @property
+    def _current(self):
+        return getattr(self._local, "current", None)
+
+    @_current.setter
+    def _current(self, p):
+        self._local.current = p
+
+    def _entry(self, p):
+        try:
+            return self._stats[p]
+        except KeyError:
+            entry = self._stats[p] = {
+                "calls": 0,
+                "time": 0.0,
+                "max_time": 0.0,
+                "lookups": 0,
+            }
+            return entry
+
+    def instrument(self, p, rule):
+        """Returns the timed rule; its inplace attribute is the timed in-place
+        version of the rule (see walk_inplace)."""
+        instrumented = update_wrapper(self._timed(p, rule), rule)
+        instrumented.inplace = self._timed(p, as_inplace(rule))
+        return instrumented
+
+    def _timed(self, p, rule):
+        def timed(a, s, p_, os):
+            previous, self._current = self._current, p
+            t0 = perf_counter()
+            try:
+                return rule(a, s, p_, os)
+            finally:
+                elapsed = perf_counter() - t0
+                self._current = previous
+                with self._lock:
+                    entry = self._entry(p)
+                    entry["calls"] += 1
+                    entry["time"] += elapsed
+                    if elapsed > entry["max_time"]:
+                        entry["max_time"] = elapsed
+
+        return timed
+
+    def count_lookups(self, n=1):
+        current = self._current
+        with self._lock:
+            self._entry(current)["lookups"] += n
+
+    def lookup(self, lookupObject):
+        return CountingLookup(lookupObject, self)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                (p if p is None else to_curie(p)): dict(entry)
+                for p, entry in self._stats.items()
+            }
+
+
+class CountingLookup:
+    def __init__(self, lookupObject, stats):
+        self.lookupObject = lookupObject
+        self._stats = stats
+        if hasattr(lookupObject, "lookupMany"):
+            self.lookupMany = self._lookupMany
+
+    def lookupById(self, scheme, value):
+        self._stats.count_lookups()
+        return self.lookupObject.lookupById(scheme, value)
+
+    def lookupByValue(self, scheme, value):
+        self._stats.count_lookups()
+        return self.lookupObject.lookupByValue(scheme, value)
+
+    def _lookupMany(self, requests):
+        requests = list(requests)
+        self._stats.count_lookups(len(requests))
+        return self.lookupObject.lookupMany(requests)
+
+    def __getattr__(self, name):
+        return getattr(self.lookupObject, name)
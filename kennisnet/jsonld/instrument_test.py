@@ -0,0 +1,65 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .instrument import RuleStats
+from .ns import schema
+
+
+class Lookup:
+    def lookupByValue(self, scheme, value):
+        return value
+
+    def lookupById(self, scheme, value):
+        return value
+
+
+def test_rule_stats():
+    stats = RuleStats()
+    lookup = stats.lookup(Lookup())
+
+    def rule(a, s, p, os):
+        """Documentation"""
+        for o in os:
+            lookup.lookupByValue("scheme", o)
+        return a | {p: os}
+
+    rule.lookup_info = {"scheme": {}}
+    instrumented = stats.instrument(schema + "keywords", rule)
+    assert instrumented.__doc__ == "Documentation"
+    assert instrumented.lookup_info == {"scheme": {}}
+    assert not hasattr(lookup, "lookupMany")
+
+    assert instrumented({}, {}, schema + "keywords", ["a", "b"]) == {
+        schema + "keywords": ["a", "b"]
+    }
+    instrumented({}, {}, schema + "keywords", ["c"])
+    lookup.lookupById("scheme", "outside a rule")
+    result = stats.as_dict()
+    assert result["schema:keywords"]["calls"] == 2
+    assert result["schema:keywords"]["lookups"] == 3
+    assert result["schema:keywords"]["time"] >= result["schema:keywords"]["max_time"]
+    assert result[None]["lookups"] == 1
+    stats.reset()
+    assert stats.as_dict() == {}
@@ -0,0 +1,402 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from collections import Counter, OrderedDict, namedtuple
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+import json
+
+LookupResult = namedtuple(
+    "LookupResult",
+    ["id", "identifier", "source", "labels", "uri", "exactMatch", "type"],
+    defaults=[None, None, None, (), None, None, None],
+)
+_empty = LookupResult()
+
+
+def lookup_many(lookupObject, requests):
+    """Resolves (method, scheme, value) requests, with lookupMany if the lookup
+    object has it and one by one otherwise. Returns a dict request -> result."""
+    lookupMany = getattr(lookupObject, "lookupMany", None)
+    if lookupMany is not None:
+        return lookupMany(requests)
+    return {
+        (method, scheme, value): getattr(lookupObject, method)(scheme, value)
+        for method, scheme, value in requests
+    }
+
+
+class TableLookup:
+    """Lookup object on a table {"byValue": {scheme: {value: result}}, "byId":
+    {scheme: {id: result}}} where a result is a dict with LookupResult fields.
+    Reports are ignored."""
+
+    def __init__(self, table):
+        self.by_value = self._results(table.get("byValue", {}))
+        self.by_id = self._results(table.get("byId", {}))
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _results(schemes):
+        return {
+            scheme: {
+                value: LookupResult(
+                    **(
+                        result
+                        | {"labels": tuple(tuple(l) for l in result.get("labels", ()))}
+                    )
+                )
+                for value, result in results.items()
+            }
+            for scheme, results in schemes.items()
+        }
+
+    def report_invalid(self, key, value):
+        pass
+
+    def report_not_found(self, key, value):
+        pass
+
+    def lookupById(self, scheme, value):
+        return self.by_id.get(scheme, {}).get(value, _empty)
+
+    def lookupByValue(self, scheme, value):
+        return self.by_value.get(scheme, {}).get(value, _empty)
+
+    def dumpScheme(self, scheme):
+        return {
+            "byValue": dict(self.by_value.get(scheme, {})),
+            "byId": dict(self.by_id.get(scheme, {})),
+        }
+
+
+def lookup_schemes(info):
+    """The lookup schemes named in an enrich info dict, in order."""
+    return list(
+        dict.fromkeys(scheme for p in info.values() for scheme in p.get("lookups", {}))
+    )
+
+
+class WarmLookup:
+    """Serves lookups from whole schemes loaded up front by warm_up(schemes),
+    for instance right after a deploy, so the first records are not slower
+    than the rest. The wrapped lookup object dumps a scheme with
+    dumpScheme(scheme), returning {"byValue": {value: result}, "byId": {id:
+    result}}; warm_up raises ValueError when it has none. Lookups of values
+    not in a dump go to the wrapped lookup object, and lookupMany and
+    dumpScheme are only there if the wrapped lookup object has them."""
+
+    def __init__(self, lookupObject):
+        self.lookupObject = lookupObject
+        self._results = {}
+        if hasattr(lookupObject, "lookupMany"):
+            self.lookupMany = self._lookupMany
+        if hasattr(lookupObject, "dumpScheme"):
+            self.dumpScheme = lookupObject.dumpScheme
+
+    def warm_up(self, schemes):
+        """(Re)loads the schemes; returns the number of results per scheme."""
+        dumpScheme = getattr(self.lookupObject, "dumpScheme", None)
+        if dumpScheme is None:
+            raise ValueError(
+                f"Lookup object {self.lookupObject!r} has no dumpScheme to warm up from"
+            )
+        results, loaded = {}, {}
+        for scheme in schemes:
+            dump = dumpScheme(scheme)
+            for kind, method in [("byValue", "lookupByValue"), ("byId", "lookupById")]:
+                for value, result in dump.get(kind, {}).items():
+                    results[method, scheme, value] = result
+            loaded[scheme] = sum(
+                len(dump.get(kind, {})) for kind in ("byValue", "byId")
+            )
+        self._results = results
+        return loaded
+
+    def __len__(self):
+        return len(self._results)
+
+    def report_invalid(self, key, value):
+        self.lookupObject.report_invalid(key, value)
+
+    def report_not_found(self, key, value):
+        self.lookupObject.report_not_found(key, value)
+
+    def lookupById(self, scheme, value):
+        result = self._results.get(("lookupById", scheme, value))
+        if result is None:
+            return self.lookupObject.lookupById(scheme, value)
+        return result
+
+    def lookupByValue(self, scheme, value):
+        result = self._results.get(("lookupByValue", scheme, value))
+        if result is None:
+            return self.lookupObject.lookupByValue(scheme, value)
+        return result
+
+    def _lookupMany(self, requests):
+        cached = self._results
+        results = {}
+        missing = []
+        for request in requests:
+            if (result := cached.get(request)) is not None:
+                results[request] = result
+            else:
+                missing.append(request)
+        if missing:
+            results.update(self.lookupObject.lookupMany(missing))
+        return results
+
+
+class CachingLookup:
+    """Wraps a lookup object and memoizes lookupByValue/lookupById results per
+    (method, scheme, value). At most maxsize results are kept (least recently
+    used are evicted first); with a ttl (seconds) results expire after that
+    time. Reports are passed to the wrapped lookup object, lookupMany and
+    dumpScheme are only there if the wrapped lookup object has them. It can
+    be shared between threads; lookups are done outside its lock."""
+
+    def __init__(self, lookupObject, maxsize=10000, ttl=None, clock=monotonic):
+        self.lookupObject = lookupObject
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if hasattr(lookupObject, "lookupMany"):
+            self.lookupMany = self._lookupMany
+        if hasattr(lookupObject, "dumpScheme"):
+            self.dumpScheme = lookupObject.dumpScheme
+
+    def report_invalid(self, key, value):
+        self.lookupObject.report_invalid(key, value)
+
+    def report_not_found(self, key, value):
+        self.lookupObject.report_not_found(key, value)
+
+    def lookupById(self, scheme, value):
+        return self._lookup("lookupById", scheme, value)
+
+    def lookupByValue(self, scheme, value):
+        return self._lookup("lookupByValue", scheme, value)
+
+    def _lookupMany(self, requests):
+        now = None if self.ttl is None else self._clock()
+        results = {}
+        missing = []
+        for request in requests:
+            if (result := self._get(request, now)) is not None:
+                results[request] = result
+            else:
+                missing.append(request)
+        if missing:
+            for request, result in self.lookupObject.lookupMany(missing).items():
+                self._store(request, result, now)
+                results[request] = result
+        return results
+
+    def _lookup(self, method, scheme, value):
+        key = (method, scheme, value)
+        now = None if self.ttl is None else self._clock()
+        if (result := self._get(key, now)) is not None:
+            return result
+        result = getattr(self.lookupObject, method)(scheme, value)
+        self._store(key, result, now)
+        return result
+
+    def _get(self, key, now):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires is None or now < expires:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._cache[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def _store(self, key, result, now):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._cache[key] = (result, None if now is None else now + self.ttl)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class PrefetchLookup:
+    """Serves lookups from results resolved in bulk by prefetch(requests).
+    Lookups that were not prefetched go to the wrapped lookup object one by
+    one. Lookup objects without lookupMany are not prefetched at all, and
+    lookupMany and dumpScheme are only there if the wrapped lookup object
+    has them.
+
+    Prefetches can overlap, also from several threads: a result is kept
+    until the last prefetch that asked for it is done."""
+
+    def __init__(self, lookupObject):
+        self.lookupObject = lookupObject
+        self._results = {}
+        self._users = Counter()
+        self._lock = Lock()
+        if hasattr(lookupObject, "lookupMany"):
+            self.lookupMany = self._lookupMany
+        if hasattr(lookupObject, "dumpScheme"):
+            self.dumpScheme = lookupObject.dumpScheme
+
+    @contextmanager
+    def prefetch(self, requests):
+        held = []
+        try:
+            if hasattr(self.lookupObject, "lookupMany"):
+                missing = []
+                with self._lock:
+                    for r in dict.fromkeys(requests):
+                        if r in self._results:
+                            self._users[r] += 1
+                            held.append(r)
+                        else:
+                            missing.append(r)
+                if missing:
+                    added = self.lookupObject.lookupMany(missing)
+                    with self._lock:
+                        for r, result in added.items():
+                            self._results.setdefault(r, result)
+                            self._users[r] += 1
+                            held.append(r)
+            yield self
+        finally:
+            with self._lock:
+                for r in held:
+                    self._users[r] -= 1
+                    if not self._users[r]:
+                        del self._users[r]
+                        del self._results[r]
+
+    def report_invalid(self, key, value):
+        self.lookupObject.report_invalid(key, value)
+
+    def report_not_found(self, key, value):
+        self.lookupObject.report_not_found(key, value)
+
+    def lookupById(self, scheme, value):
+        result = self._results.get(("lookupById", scheme, value))
+        if result is None:
+            return self.lookupObject.lookupById(scheme, value)
+        return result
+
+    def lookupByValue(self, scheme, value):
+        result = self._results.get(("lookupByValue", scheme, value))
+        if result is None:
+            return self.lookupObject.lookupByValue(scheme, value)
+        return result
+
+    def _lookupMany(self, requests):
+        results = {}
+        missing = []
+        for request in requests:
+            if (result := self._results.get(request)) is not None:
+                results[request] = result
+            else:
+                missing.append(request)
+        if missing:
+            results.update(self.lookupObject.lookupMany(missing))
+        return results
+
+
+class NegativeCache:
+    """Bounded set of keys known to have no (useful) lookup result; the least
+    recently seen are dropped first. maxsize 0 keeps nothing. It can be
+    shared between threads."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._keys:
+                self._keys.move_to_end(key)
+                self.hits += 1
+                return True
+            return False
+
+    def add(self, key):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+
+__all__ = [
+    "LookupResult",
+    "TableLookup",
+    "CachingLookup",
+    "PrefetchLookup",
+    "NegativeCache",
+    "WarmLookup",
+    "lookup_many",
+    "lookup_schemes",
+]
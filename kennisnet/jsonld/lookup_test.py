@@ -0,0 +1,274 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .lookup import (
+    CachingLookup,
+    PrefetchLookup,
+    NegativeCache,
+    WarmLookup,
+    lookup_many,
+    lookup_schemes,
+)
+
+from .enrich_test import MockLookup, RecordingMockLookup, _l
+
+import pytest
+
+status = "urn:lms:status"
+conceptset = "urn:edurep:conceptset"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_caching_lookup():
+    lookup = RecordingMockLookup()
+    cache = CachingLookup(lookup)
+    assert cache.lookupByValue(status, "definitief").identifier == "final"
+    assert cache.lookupByValue(status, "definitief").identifier == "final"
+    assert cache.lookupById(conceptset, "uri:has_match").id == "uri:has_match"
+    assert cache.lookupByValue("urn:lms:mimetype", "definitief").identifier is None
+    assert lookup.calls == [
+        ("lookupByValue", status, "definitief"),
+        ("lookupById", conceptset, "uri:has_match"),
+        ("lookupByValue", "urn:lms:mimetype", "definitief"),
+    ]
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 3,
+        "evictions": 0,
+        "expirations": 0,
+        "size": 3,
+        "maxsize": 10000,
+    }
+
+
+def test_caching_lookup_evicts_least_recently_used():
+    lookup = RecordingMockLookup()
+    cache = CachingLookup(lookup, maxsize=2)
+    cache.lookupByValue("scheme", "a")
+    cache.lookupByValue("scheme", "b")
+    cache.lookupByValue("scheme", "a")
+    cache.lookupByValue("scheme", "c")
+    assert cache.evictions == 1
+    cache.lookupByValue("scheme", "a")
+    cache.lookupByValue("scheme", "b")
+    assert [v for _, _, v in lookup.calls] == ["a", "b", "c", "b"]
+    assert cache.stats()["size"] == 2
+
+
+def test_caching_lookup_ttl():
+    lookup = RecordingMockLookup()
+    clock = Clock()
+    cache = CachingLookup(lookup, ttl=10, clock=clock)
+    cache.lookupByValue("scheme", "a")
+    clock.now = 9.9
+    cache.lookupByValue("scheme", "a")
+    assert len(lookup.calls) == 1
+    clock.now = 10.0
+    cache.lookupByValue("scheme", "a")
+    assert len(lookup.calls) == 2
+    assert cache.expirations == 1
+    assert cache.hits == 1
+
+
+def test_caching_lookup_reports():
+    lookup = MockLookup()
+    cache = CachingLookup(lookup)
+    cache.report_invalid("schema:encodingFormat", "text/nonsense")
+    cache.report_not_found("schema:teaches", "urn:uuid:unknown")
+    assert lookup.invalid == [("schema:encodingFormat", "text/nonsense")]
+    assert lookup.not_found == [("schema:teaches", "urn:uuid:unknown")]
+
+
+def test_lookup_many():
+    requests = [
+        ("lookupByValue", status, "definitief"),
+        ("lookupById", conceptset, "uri:has_match"),
+    ]
+    lookup = RecordingMockLookup()
+    results = lookup_many(lookup, requests)
+    assert results[requests[0]].identifier == "final"
+    assert results[requests[1]].id == "uri:has_match"
+    assert lookup.calls == requests
+
+    lookup = RecordingMockLookup(batch=True)
+    assert lookup_many(lookup, requests) == results
+    assert lookup.batches == [requests]
+    assert lookup.calls == []
+
+
+def test_caching_lookup_many():
+    lookup = RecordingMockLookup(batch=True)
+    cache = CachingLookup(lookup)
+    cache.lookupByValue(status, "definitief")
+    results = cache.lookupMany(
+        [("lookupByValue", status, "definitief"), ("lookupByValue", conceptset, "VO")]
+    )
+    assert results[("lookupByValue", status, "definitief")].identifier == "final"
+    assert results[("lookupByValue", conceptset, "VO")].labels == [("VO", "nl")]
+    assert lookup.batches == [[("lookupByValue", conceptset, "VO")]]
+    assert cache.lookupByValue(conceptset, "VO").labels == [("VO", "nl")]
+    assert cache.stats()["hits"] == 2
+
+    lookup = RecordingMockLookup()
+    cache = CachingLookup(lookup)
+    assert not hasattr(cache, "lookupMany")
+    assert lookup_many(cache, [("lookupByValue", status, "definitief")]) == {
+        ("lookupByValue", status, "definitief"): lookup.lookupByValue(
+            status, "definitief"
+        )
+    }
+
+
+def test_prefetch_lookup():
+    lookup = RecordingMockLookup(batch=True)
+    prefetch = PrefetchLookup(lookup)
+    with prefetch.prefetch(
+        [
+            ("lookupByValue", status, "definitief"),
+            ("lookupByValue", status, "definitief"),
+            ("lookupById", conceptset, "uri:has_match"),
+        ]
+    ):
+        assert lookup.batches == [
+            [
+                ("lookupByValue", status, "definitief"),
+                ("lookupById", conceptset, "uri:has_match"),
+            ]
+        ]
+        with prefetch.prefetch([("lookupByValue", status, "definitief")]):
+            assert len(lookup.batches) == 1
+        assert prefetch.lookupByValue(status, "definitief").identifier == "final"
+        assert prefetch.lookupById(conceptset, "uri:has_match").id == "uri:has_match"
+        assert lookup.calls == []
+        assert prefetch.lookupByValue(status, "concept").identifier is None
+        assert lookup.calls == [("lookupByValue", status, "concept")]
+    prefetch.lookupByValue(status, "definitief")
+    assert lookup.calls[-1] == ("lookupByValue", status, "definitief")
+
+
+def test_prefetch_lookup_backend_fails():
+    def fail(requests):
+        raise ConnectionError("lookup service unavailable")
+
+    lookup = RecordingMockLookup(batch=True)
+    prefetch = PrefetchLookup(lookup)
+    with prefetch.prefetch([("lookupByValue", status, "definitief")]):
+        lookup.lookupMany = fail
+        with pytest.raises(ConnectionError):
+            with prefetch.prefetch(
+                [
+                    ("lookupByValue", status, "definitief"),
+                    ("lookupByValue", status, "concept"),
+                ]
+            ):
+                pass
+    lookup.by_value = lookup.by_value | {status: {"definitief": _l(identifier="new")}}
+    assert prefetch.lookupByValue(status, "definitief").identifier == "new"
+
+
+def test_prefetch_lookup_without_lookupMany():
+    lookup = RecordingMockLookup()
+    prefetch = PrefetchLookup(lookup)
+    assert not hasattr(prefetch, "lookupMany")
+    with prefetch.prefetch([("lookupByValue", status, "definitief")]):
+        assert lookup.calls == []
+        assert prefetch.lookupByValue(status, "definitief").identifier == "final"
+    assert lookup.calls == [("lookupByValue", status, "definitief")]
+    prefetch.report_invalid("schema:encodingFormat", "text/nonsense")
+    assert lookup.invalid == [("schema:encodingFormat", "text/nonsense")]
+
+
+def test_warm_lookup():
+    lookup = RecordingMockLookup()
+    warm = WarmLookup(lookup)
+    assert not hasattr(warm, "lookupMany")
+    concepts = 1 + len(lookup.by_id[conceptset])
+    assert warm.warm_up([status, conceptset]) == {status: 1, conceptset: concepts}
+    assert len(warm) == 1 + concepts
+    assert lookup.dumped == [status, conceptset]
+    assert warm.lookupByValue(status, "definitief").identifier == "final"
+    assert warm.lookupById(conceptset, "uri:has_match").id == "uri:has_match"
+    assert lookup.calls == []
+    assert warm.lookupByValue(status, "concept").identifier is None
+    assert lookup.calls == [("lookupByValue", status, "concept")]
+    warm.report_not_found("schema:about", "x")
+    assert lookup.not_found == [("schema:about", "x")]
+
+    with pytest.raises(ValueError):
+        WarmLookup(MockLookup()).warm_up([status])
+
+
+def test_wrappers_pass_dumpScheme():
+    for wrapper in [CachingLookup, PrefetchLookup, WarmLookup]:
+        lookup = RecordingMockLookup()
+        assert wrapper(lookup).dumpScheme(status) == lookup.dumpScheme(status)
+        assert not hasattr(wrapper(MockLookup()), "dumpScheme")
+
+
+def test_warm_lookup_many():
+    lookup = RecordingMockLookup(batch=True)
+    warm = WarmLookup(lookup)
+    assert warm.warm_up([status]) == {status: 1}
+    results = warm.lookupMany(
+        [("lookupByValue", status, "definitief"), ("lookupByValue", status, "concept")]
+    )
+    assert results[("lookupByValue", status, "definitief")].identifier == "final"
+    assert results[("lookupByValue", status, "concept")].identifier is None
+    assert lookup.batches == [[("lookupByValue", status, "concept")]]
+
+
+def test_lookup_schemes():
+    info = {
+        "schema:keywords": {"lookups": {"urn:edurep:conceptset": {}}},
+        "schema:name": {"documentation": "Name"},
+        "schema:teaches": {"lookups": {"urn:edurep:conceptset": {}}},
+        "schema:encodingFormat": {"lookups": {"urn:lms:mimetype": {}}},
+    }
+    assert lookup_schemes(info) == ["urn:edurep:conceptset", "urn:lms:mimetype"]
+
+
+def test_negative_cache():
+    misses = NegativeCache(maxsize=2)
+    misses.add("a")
+    misses.add("b")
+    assert "a" in misses
+    misses.add("c")
+    assert "a" in misses and "c" in misses
+    assert "b" not in misses
+    assert len(misses) == 2
+    assert misses.hits == 3
+    misses.clear()
+    assert "a" not in misses
+
+    misses = NegativeCache(maxsize=0)
+    misses.add("a")
+    assert "a" not in misses
@@ -0,0 +1,117 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+import os
+
+
+class ReportingLookup:
+    """Keeps the reports of a worker so they can be sent back to the caller."""
+
+    def __init__(self, lookupObject):
+        self.lookupObject = lookupObject
+        self.reports = []
+
+    def report_invalid(self, key, value):
+        self.reports.append(("report_invalid", key, value))
+
+    def report_not_found(self, key, value):
+        self.reports.append(("report_not_found", key, value))
+
+    def __getattr__(self, name):
+        return getattr(self.lookupObject, name)
+
+
+_worker = None
+
+
+def _init_worker(lookup_factory, enrich_kwargs):
+    global _worker
+    lookup = ReportingLookup(lookup_factory())
+    _worker = prepare_enrich(lookup, **enrich_kwargs)[0], lookup
+
+
+def _enrich_chunk(chunk):
+    enrich, lookup = _worker
+    results = [enrich(data) for data in chunk]
+    reports, lookup.reports = lookup.reports, []
+    return results, reports
+
+
+def chunks(iterable, size):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def enrich_many(
+    records,
+    lookup_factory,
+    workers=None,
+    chunksize=100,
+    ordered=True,
+    reporter=None,
+    **enrich_kwargs,
+):
+    """Enriches records in a pool of worker processes. Each worker builds its
+    enrich function once with prepare_enrich(lookup_factory(), **enrich_kwargs).
+    Records are sent in chunks, with at most two chunks per worker in flight, and
+    the results are yielded in input order, or as soon as they are ready with
+    ordered=False. The reports of all workers are passed to reporter (an object
+    with report_invalid and report_not_found)."""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(lookup_factory, enrich_kwargs)
+    ) as executor:
+        pending = deque()
+
+        def completed():
+            if ordered:
+                return [pending.popleft()]
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+            return done
+
+        def results(futures):
+            for future in futures:
+                chunk_results, reports = future.result()
+                if reporter is not None:
+                    for method, key, value in reports:
+                        getattr(reporter, method)(key, value)
+                yield from chunk_results
+
+        for chunk in chunks(records, chunksize):
+            pending.append(executor.submit(_enrich_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from results(completed())
+        while pending:
+            yield from results(completed())
+
+
+__all__ = ["enrich_many"]
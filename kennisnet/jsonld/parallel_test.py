@@ -0,0 +1,79 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from .enrich_test import MockLookup, example
+from .parallel import enrich_many, chunks
+
+import json
+
+
+def records():
+    for i in range(25):
+        yield example(
+            {
+                "@id": f"some:id:{i}",
+                "schema:creativeWorkStatus": "definitief",
+                "schema:encodingFormat": f"text/unknown-{i % 3}",
+                "schema:educationalLevel": {"@id": "uri:has_match"},
+            }
+        )[0]
+
+
+def test_chunks():
+    assert list(chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunks([], 2)) == []
+
+
+def test_enrich_many():
+    lookup = MockLookup()
+    enrich = prepare_enrich(lookup)[0]
+    expected = [enrich(record) for record in records()]
+
+    reporter = MockLookup()
+    results = list(
+        enrich_many(records(), MockLookup, workers=2, chunksize=3, reporter=reporter)
+    )
+    assert results == expected
+    assert sorted(reporter.invalid) == sorted(lookup.invalid)
+    assert len(reporter.invalid) == 25
+
+
+def test_enrich_many_unordered():
+    enrich = prepare_enrich(MockLookup())[0]
+    expected = [enrich(record) for record in records()]
+    results = list(
+        enrich_many(records(), MockLookup, workers=2, chunksize=4, ordered=False)
+    )
+    key = lambda r: json.dumps(r, sort_keys=True)
+    assert sorted(results, key=key) == sorted(expected, key=key)
+
+
+def test_enrich_many_prefetch():
+    enrich = prepare_enrich(MockLookup())[0]
+    expected = [enrich(record) for record in records()]
+    assert (
+        list(enrich_many(records(), MockLookup, workers=1, prefetch=True)) == expected
+    )
@@ -0,0 +1,176 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .lookup import LookupResult
+from threading import Lock
+import json
+import sqlite3
+
+
+def dump_result(result):
+    return json.dumps(list(result), separators=(",", ":"), ensure_ascii=False)
+
+
+def load_result(text):
+    fields = json.loads(text)
+    fields[3] = tuple(tuple(l) for l in fields[3] or ())
+    return LookupResult(*fields)
+
+
+class PersistentLookup:
+    """Wraps a lookup object and keeps its lookupByValue/lookupById results in
+    a sqlite database, keyed by vocabulary version, so a restarted process
+    does not ask the lookup object again. Results of other versions are
+    deleted when the database is opened. With eager=True all results are
+    read at startup, otherwise they are read when first asked for; both are
+    kept in memory afterwards. Writes are committed every commit_every
+    results and on commit() or close(). Reports are passed to the wrapped
+    lookup object, lookupMany and dumpScheme are only there if it has them.
+    It can be shared between threads."""
+
+    def __init__(self, lookupObject, path, version, eager=False, commit_every=1000):
+        self.lookupObject = lookupObject
+        self.version = version
+        self.commit_every = commit_every
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS lookups (version TEXT, method TEXT,"
+            " scheme TEXT, value TEXT, result TEXT,"
+            " PRIMARY KEY (version, method, scheme, value))"
+        )
+        self._db.execute("DELETE FROM lookups WHERE version != ?", (version,))
+        self._db.commit()
+        self._lock = Lock()
+        self._pending = 0
+        self._results = {}
+        self.eager = eager
+        if eager:
+            for method, scheme, value, result in self._db.execute(
+                "SELECT method, scheme, value, result FROM lookups WHERE version = ?",
+                (version,),
+            ):
+                self._results[method, scheme, value] = load_result(result)
+        self.hits = 0
+        self.misses = 0
+        if hasattr(lookupObject, "lookupMany"):
+            self.lookupMany = self._lookupMany
+        if hasattr(lookupObject, "dumpScheme"):
+            self.dumpScheme = lookupObject.dumpScheme
+
+    def report_invalid(self, key, value):
+        self.lookupObject.report_invalid(key, value)
+
+    def report_not_found(self, key, value):
+        self.lookupObject.report_not_found(key, value)
+
+    def lookupById(self, scheme, value):
+        return self._lookup("lookupById", scheme, value)
+
+    def lookupByValue(self, scheme, value):
+        return self._lookup("lookupByValue", scheme, value)
+
+    def _lookup(self, method, scheme, value):
+        if value is None:
+            return getattr(self.lookupObject, method)(scheme, value)
+        key = (method, scheme, value)
+        if (result := self._get(key)) is not None:
+            return result
+        result = getattr(self.lookupObject, method)(scheme, value)
+        self._store(key, result)
+        return result
+
+    def _lookupMany(self, requests):
+        results = {}
+        missing = []
+        for request in requests:
+            if request[2] is not None and (result := self._get(request)) is not None:
+                results[request] = result
+            else:
+                missing.append(request)
+        if missing:
+            for request, result in self.lookupObject.lookupMany(missing).items():
+                if request[2] is not None:
+                    self._store(request, result)
+                results[request] = result
+        return results
+
+    def _get(self, key):
+        with self._lock:
+            result = self._results.get(key)
+            if result is None and not self.eager:
+                row = self._db.execute(
+                    "SELECT result FROM lookups WHERE version = ? AND method = ?"
+                    " AND scheme = ? AND value = ?",
+                    (self.version, *key),
+                ).fetchone()
+                if row is not None:
+                    result = self._results[key] = load_result(row[0])
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def _store(self, key, result):
+        with self._lock:
+            self._results[key] = result
+            self._db.execute(
+                "INSERT OR REPLACE INTO lookups (version, method, scheme, value,"
+                " result) VALUES (?, ?, ?, ?, ?)",
+                (self.version, *key, dump_result(result)),
+            )
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM lookups WHERE version = ?", (self.version,)
+            ).fetchone()[0]
+
+    def _commit(self):
+        self._db.commit()
+        self._pending = 0
+
+    def commit(self):
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        self.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+__all__ = ["PersistentLookup"]
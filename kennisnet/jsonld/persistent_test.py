@@ -0,0 +1,108 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich_test import MockLookup, RecordingMockLookup
+from .lookup import LookupResult
+from .persistent import PersistentLookup
+
+import pytest
+
+status = "urn:lms:status"
+conceptset = "urn:edurep:conceptset"
+
+
+def lookups(lookup):
+    return [
+        lookup.lookupByValue(conceptset, "VO"),
+        lookup.lookupByValue(status, "definitief"),
+        lookup.lookupByValue(status, "unknown"),
+        lookup.lookupById(conceptset, "uri:has_match"),
+    ]
+
+
+@pytest.mark.parametrize("eager", [False, True])
+def test_persistent_lookup(tmp_path, eager):
+    path = str(tmp_path / "lookups.sqlite")
+    expected = lookups(MockLookup())
+    with PersistentLookup(RecordingMockLookup(), path, "v1") as lookup:
+        assert lookups(lookup) == expected
+        assert len(lookup.lookupObject.calls) == 4
+        lookups(lookup)
+        assert len(lookup.lookupObject.calls) == 4
+        assert len(lookup) == 4
+
+    with PersistentLookup(RecordingMockLookup(), path, "v1", eager=eager) as lookup:
+        results = lookups(lookup)
+        assert results == [
+            r._replace(labels=tuple(tuple(l) for l in r.labels)) for r in expected
+        ]
+        assert isinstance(results[0], LookupResult)
+        assert results[3].exactMatch == "uri:matches"
+        assert lookup.lookupObject.calls == []
+        assert lookup.stats() == {"hits": 4, "misses": 0, "size": 4}
+        lookup.lookupByValue(status, "herzien")
+        assert lookup.lookupObject.calls == [("lookupByValue", status, "herzien")]
+        lookup.report_invalid("schema:creativeWorkStatus", "herzien")
+        assert lookup.lookupObject.invalid == [("schema:creativeWorkStatus", "herzien")]
+
+
+def test_persistent_lookup_version_bump(tmp_path):
+    path = str(tmp_path / "lookups.sqlite")
+    with PersistentLookup(RecordingMockLookup(), path, "v1") as lookup:
+        lookups(lookup)
+    with PersistentLookup(RecordingMockLookup(), path, "v2") as lookup:
+        assert len(lookup) == 0
+        lookups(lookup)
+        assert len(lookup.lookupObject.calls) == 4
+    with PersistentLookup(RecordingMockLookup(), path, "v1") as lookup:
+        assert len(lookup) == 0
+
+
+def test_persistent_lookup_many(tmp_path):
+    lookup_object = RecordingMockLookup(batch=True)
+    with PersistentLookup(
+        lookup_object, str(tmp_path / "lookups.sqlite"), "v1"
+    ) as lookup:
+        assert lookup.lookupByValue(status, "definitief").identifier == "final"
+        results = lookup.lookupMany(
+            [
+                ("lookupByValue", status, "definitief"),
+                ("lookupByValue", status, "concept"),
+                ("lookupByValue", status, None),
+            ]
+        )
+        assert results[("lookupByValue", status, "definitief")].identifier == "final"
+        assert results[("lookupByValue", status, "concept")].identifier is None
+        assert lookup_object.batches == [
+            [("lookupByValue", status, "concept"), ("lookupByValue", status, None)]
+        ]
+        assert len(lookup) == 2
+        assert lookup.dumpScheme(status)["byValue"] == {
+            "definitief": lookup_object.by_value[status]["definitief"]
+        }
+    other = str(tmp_path / "other.sqlite")
+    with PersistentLookup(MockLookup(), other, "v1") as lookup:
+        assert not hasattr(lookup, "lookupMany")
+        assert not hasattr(lookup, "dumpScheme")
@@ -0,0 +1,230 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from collections import Counter
+from contextlib import contextmanager
+from heapq import heappush, heapreplace, nsmallest
+from threading import Lock, local
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters sketch (Metwally et al.) over at most k
+    values. A new value that does not fit replaces the value with the lowest
+    count and inherits that count as its error. For N added occurrences the
+    count of a kept value is at most N/k too high and never too low
+    (count - error is a lower bound), and every value occurring more than N/k
+    times is kept. Merging adds the counts, counting a value missing from a
+    full sketch with that sketch's lowest count, and keeps the k highest; the
+    error of the kept values stays within N/k for N over all merged sketches.
+    Values with the same count are ordered by lowest error, then by value."""
+
+    def __init__(self, k=1000):
+        self.k = k
+        self.n = 0
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+
+    def add(self, value, n=1):
+        self.n += n
+        counts = self.counts
+        if value in counts:
+            counts[value] += n
+            return
+        if len(counts) < self.k:
+            counts[value] = n
+            self.errors[value] = 0
+            heappush(self._heap, (n, value))
+            return
+        heap = self._heap
+        # heap entries are not updated when a count grows; refresh stale ones
+        while (c := counts[heap[0][1]]) != heap[0][0]:
+            heapreplace(heap, (c, heap[0][1]))
+        c, evicted = heap[0]
+        del counts[evicted], self.errors[evicted]
+        counts[value] = c + n
+        self.errors[value] = c
+        heapreplace(heap, (c + n, value))
+
+    def minimum(self):
+        """The count a value not kept may have at most."""
+        return min(self.counts.values()) if len(self.counts) >= self.k else 0
+
+    def merge(self, other):
+        m1, m2 = self.minimum(), other.minimum()
+        merged = {
+            v: (
+                self.counts.get(v, m1) + other.counts.get(v, m2),
+                self.errors.get(v, m1) + other.errors.get(v, m2),
+            )
+            for v in self.counts.keys() | other.counts.keys()
+        }
+        kept = nsmallest(self.k, merged.items(), key=self._rank)
+        self.n += other.n
+        self.counts = {v: c for v, (c, e) in kept}
+        self.errors = {v: e for v, (c, e) in kept}
+        self._heap = sorted((c, v) for v, c in self.counts.items())
+
+    @staticmethod
+    def _rank(item):
+        # highest count first, then lowest error, then value: ties do not
+        # depend on the order of the values
+        value, (count, error) = item
+        return -count, error, value
+
+    def top(self, n=10):
+        """The n most occurring values as (value, count, error)."""
+        return [
+            (v, c, self.errors[v])
+            for v, c in nsmallest(
+                n,
+                self.counts.items(),
+                key=lambda item: self._rank((item[0], (item[1], self.errors[item[0]]))),
+            )
+        ]
+
+    def __len__(self):
+        return len(self.counts)
+
+
+class RecordSummary:
+    """The reports of one record: counts per (kind, key) and the first
+    max_values distinct values."""
+
+    def __init__(self, record_id=None, max_values=10):
+        self.record_id = record_id
+        self.max_values = max_values
+        self.counts = Counter()
+        self.values = {}
+
+    def add(self, kind, key, value):
+        self.counts[kind, key] += 1
+        values = self.values.setdefault((kind, key), [])
+        if len(values) < self.max_values and value not in values:
+            values.append(value)
+
+    def __bool__(self):
+        return bool(self.counts)
+
+    def as_dict(self):
+        result = {"id": self.record_id}
+        for (kind, key), n in self.counts.items():
+            result.setdefault(kind, {})[key] = {
+                "count": n,
+                "values": self.values[kind, key],
+            }
+        return result
+
+
+class ReportCollector:
+    """Collects report_invalid and report_not_found calls as counts per
+    (kind, key) and value instead of keeping every occurrence. The values of
+    each (kind, key) are counted in a SpaceSaving sketch of max_values
+    values, so memory stays bounded however many distinct values are
+    reported, and the top values are exact up to the sketch's error bound.
+    Within record(record_id) the reports are also summarised for that record.
+    Lookups go to the wrapped lookup object, so a collector can be given to
+    prepare_enrich as lookup object. It can be shared between threads; a
+    record's reports are those of its thread. Collectors of other processes
+    or batches, pickled without their lookup object, are combined with
+    merge()."""
+
+    def __init__(self, lookupObject=None, max_values=1000, max_record_values=10):
+        self.lookupObject = lookupObject
+        self.max_values = max_values
+        self.max_record_values = max_record_values
+        self.totals = Counter()
+        self._values = {}
+        self._lock = Lock()
+        self._local = local()
+
+    def report_invalid(self, key, value):
+        self._report("invalid", key, str(value))
+
+    def report_not_found(self, key, value):
+        self._report("not found", key, str(value))
+
+    def _report(self, kind, key, value):
+        with self._lock:
+            self.totals[kind, key] += 1
+            if (sketch := self._values.get((kind, key))) is None:
+                sketch = self._values[kind, key] = SpaceSaving(self.max_values)
+            sketch.add(value)
+        if (summary := getattr(self._local, "summary", None)) is not None:
+            summary.add(kind, key, value)
+
+    @contextmanager
+    def record(self, record_id=None):
+        """Yields the RecordSummary of the reports made meanwhile."""
+        previous = getattr(self._local, "summary", None)
+        summary = self._local.summary = RecordSummary(record_id, self.max_record_values)
+        try:
+            yield summary
+        finally:
+            self._local.summary = previous
+
+    def values(self, kind, key):
+        """Counter of the (estimated) counts of the values kept for (kind, key)."""
+        with self._lock:
+            sketch = self._values.get((kind, key))
+            return Counter(sketch.counts if sketch else ())
+
+    def top(self, kind, key, n=10):
+        """The n most reported values for (kind, key) as (value, count, error)."""
+        with self._lock:
+            sketch = self._values.get((kind, key))
+            return sketch.top(n) if sketch else []
+
+    def merge(self, other):
+        """Adds the counts of another collector, for instance of a batch."""
+        with other._lock, self._lock:
+            self.totals.update(other.totals)
+            for k, sketch in other._values.items():
+                if (mine := self._values.get(k)) is None:
+                    mine = self._values[k] = SpaceSaving(self.max_values)
+                mine.merge(sketch)
+
+    def write(self, out, top=10):
+        for kind, key in sorted(self.totals):
+            print(f"{kind} {key}: {self.totals[kind, key]}", file=out)
+            for value, n, error in self.top(kind, key, top):
+                more = f" (at most {error} less)" if error else ""
+                print(f"    {n:>8} {value}{more}", file=out)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"], state["_local"]
+        return state | {"lookupObject": None}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, _lock=Lock(), _local=local())
+
+    def __getattr__(self, name):
+        if name == "lookupObject":
+            raise AttributeError(name)
+        return getattr(self.lookupObject, name)
+
+
+__all__ = ["ReportCollector", "RecordSummary", "SpaceSaving"]
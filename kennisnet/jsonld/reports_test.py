@@ -0,0 +1,154 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from .enrich_test import MockLookup, example
+from .reports import ReportCollector, SpaceSaving
+
+from collections import Counter
+from io import StringIO
+import pickle
+import random
+
+
+def test_bounded_counts():
+    reports = ReportCollector(max_values=2)
+    for value in ["a", "b", "a", "c", "d", "a"]:
+        reports.report_invalid("schema:keywords", value)
+    reports.report_not_found("schema:about", "x")
+    assert reports.totals["invalid", "schema:keywords"] == 6
+    assert reports.values("invalid", "schema:keywords") == {"a": 3, "d": 3}
+    assert sorted(reports.top("invalid", "schema:keywords")) == [
+        ("a", 3, 2),
+        ("d", 3, 2),
+    ]
+    assert reports.values("not found", "schema:about") == {"x": 1}
+
+
+def zipf_stream(n, seed):
+    rng = random.Random(seed)
+    return [f"v{int(rng.paretovariate(0.8))}" for _ in range(n)]
+
+
+def assert_bounds(sketch, exact):
+    bound = sketch.n / sketch.k
+    for value, count, error in sketch.top(sketch.k):
+        assert count - error <= exact[value] <= count <= exact[value] + bound
+    for value, n in exact.items():
+        if n > bound:
+            assert value in sketch.counts
+
+
+def test_space_saving():
+    stream = zipf_stream(20000, seed=1)
+    sketch = SpaceSaving(k=50)
+    for value in stream:
+        sketch.add(value)
+    assert sketch.n == 20000 and len(sketch) == 50
+    assert_bounds(sketch, Counter(stream))
+    assert sketch.top(1)[0][0] == Counter(stream).most_common(1)[0][0]
+
+
+def test_space_saving_merge():
+    streams = [zipf_stream(10000, seed=seed) for seed in range(4)]
+    sketches = []
+    for stream in streams:
+        sketches.append(SpaceSaving(k=50))
+        for value in stream:
+            sketches[-1].add(value)
+    merged = SpaceSaving(k=50)
+    for sketch in sketches:
+        merged.merge(pickle.loads(pickle.dumps(sketch)))
+    merged.add("v1")
+    assert merged.n == 40001
+    assert_bounds(merged, Counter(sum(streams, ["v1"])))
+
+
+def test_space_saving_ties():
+    one, other = SpaceSaving(k=1), SpaceSaving(k=1)
+    one.add("b")
+    other.add("a")
+    one.merge(other)
+    assert one.top() == [("a", 2, 1)]
+
+    one, other = SpaceSaving(k=1), SpaceSaving(k=2)
+    one.add("b")
+    other.add("a")
+    other.add("b")
+    one.merge(other)
+    assert one.top() == [("b", 2, 0)]
+
+    sketch = SpaceSaving(k=3)
+    for value in ["c", "b", "a", "b"]:
+        sketch.add(value)
+    assert sketch.top() == [("b", 2, 0), ("a", 1, 0), ("c", 1, 0)]
+
+
+def test_record_summary():
+    reports = ReportCollector(MockLookup(), max_record_values=1)
+    enrich = prepare_enrich(reports)[0]
+    with reports.record("id:1") as summary:
+        enrich(
+            example(
+                {
+                    "schema:encodingFormat": [
+                        "text/nonsense",
+                        "text/other",
+                        "text/other",
+                    ]
+                }
+            )[0]
+        )
+    assert summary.as_dict() == {
+        "id": "id:1",
+        "invalid": {"schema:encodingFormat": {"count": 3, "values": ["text/nonsense"]}},
+    }
+    with reports.record("id:2") as summary:
+        enrich(example({"schema:creativeWorkStatus": "definitief"})[0])
+    assert not summary
+    assert reports.values("invalid", "schema:encodingFormat") == {
+        "text/nonsense": 1,
+        "text/other": 2,
+    }
+
+
+def test_merge_and_write():
+    total, batch = ReportCollector(max_values=1), ReportCollector()
+    total.report_invalid("k", "a")
+    for value in ["a", "a", "b"]:
+        batch.report_invalid("k", value)
+    batch.report_not_found("l", "c")
+    total.merge(pickle.loads(pickle.dumps(batch)))
+    assert total.totals == {("invalid", "k"): 4, ("not found", "l"): 1}
+    assert total.top("invalid", "k") == [("a", 3, 0)]
+    total.report_invalid("k", "d")
+    out = StringIO()
+    total.write(out)
+    assert out.getvalue() == (
+        "invalid k: 5\n"
+        "           4 d (at most 3 less)\n"
+        "not found l: 1\n"
+        "           1 c\n"
+    )
@@ -0,0 +1,110 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import local
+
+
+class ThreadReportingLookup:
+    """Keeps the reports made within collecting() per thread, so they can be
+    attributed to the record the thread enriches. Reports made outside
+    collecting() go to the wrapped lookup object."""
+
+    def __init__(self, lookupObject):
+        self.lookupObject = lookupObject
+        self._local = local()
+
+    @contextmanager
+    def collecting(self):
+        """Yields the list the (method, key, value) reports are added to."""
+        previous = getattr(self._local, "reports", None)
+        reports = self._local.reports = []
+        try:
+            yield reports
+        finally:
+            self._local.reports = previous
+
+    def _report(self, method, key, value):
+        reports = getattr(self._local, "reports", None)
+        if reports is None:
+            getattr(self.lookupObject, method)(key, value)
+        else:
+            reports.append((method, key, value))
+
+    def report_invalid(self, key, value):
+        self._report("report_invalid", key, value)
+
+    def report_not_found(self, key, value):
+        self._report("report_not_found", key, value)
+
+    def __getattr__(self, name):
+        return getattr(self.lookupObject, name)
+
+
+def enrich_threaded(
+    records,
+    lookupObject,
+    workers=8,
+    reporter=None,
+    with_reports=False,
+    **enrich_kwargs,
+):
+    """Enriches records in a pool of threads sharing one enrich function,
+    prepare_enrich(lookupObject, **enrich_kwargs), to overlap the latency of
+    a lookup object that calls a remote service; lookupObject must be safe
+    to use from several threads. At most two records per thread are in
+    flight and the results are yielded in input order. The reports of every
+    record are passed to reporter (an object with report_invalid and
+    report_not_found) in that order too; with_reports=True yields (result,
+    reports) with the (method, key, value) reports of that record."""
+    lookup = ThreadReportingLookup(lookupObject)
+    enrich = prepare_enrich(lookup, **enrich_kwargs)[0]
+
+    def enrich_record(data):
+        with lookup.collecting() as reports:
+            result = enrich(data)
+        return result, reports
+
+    def result(future):
+        result, reports = future.result()
+        if reporter is not None:
+            for method, key, value in reports:
+                getattr(reporter, method)(key, value)
+        return (result, reports) if with_reports else result
+
+    with ThreadPoolExecutor(workers) as executor:
+        pending = deque()
+        for data in records:
+            pending.append(executor.submit(enrich_record, data))
+            if len(pending) >= 2 * workers:
+                yield result(pending.popleft())
+        while pending:
+            yield result(pending.popleft())
+
+
+__all__ = ["enrich_threaded", "ThreadReportingLookup"]
@@ -0,0 +1,92 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .enrich import prepare_enrich
+from .enrich_test import MockLookup
+from .parallel_test import records
+from .threaded import enrich_threaded, ThreadReportingLookup
+
+from threading import Thread
+import time
+
+
+class SlowMockLookup(MockLookup):
+    def lookupById(self, scheme, value):
+        time.sleep(0.001)
+        return super().lookupById(scheme, value)
+
+    def lookupByValue(self, scheme, value):
+        time.sleep(0.001)
+        return super().lookupByValue(scheme, value)
+
+
+def test_thread_reporting_lookup():
+    mock = MockLookup()
+    lookup = ThreadReportingLookup(mock)
+    collected = {}
+
+    def report(name):
+        with lookup.collecting() as reports:
+            for i in range(100):
+                lookup.report_invalid(name, i)
+        collected[name] = reports
+
+    threads = [Thread(target=report, args=(name,)) for name in "abc"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for name in "abc":
+        assert collected[name] == [("report_invalid", name, i) for i in range(100)]
+    lookup.report_not_found("schema:teaches", "x")
+    assert mock.not_found == [("schema:teaches", "x")]
+    assert mock.invalid == []
+
+
+def test_enrich_threaded():
+    lookup = MockLookup()
+    enrich = prepare_enrich(lookup)[0]
+    expected = []
+    for record in records():
+        before = len(lookup.invalid)
+        expected.append((enrich(record), lookup.invalid[before:]))
+
+    reporter = MockLookup()
+    results = list(
+        enrich_threaded(records(), SlowMockLookup(), workers=4, reporter=reporter)
+    )
+    assert results == [result for result, _ in expected]
+    assert reporter.invalid == lookup.invalid
+
+    for kwargs in [{}, {"prefetch": True}, {"compiled": True, "instrument": True}]:
+        results = list(
+            enrich_threaded(
+                records(), SlowMockLookup(), workers=4, with_reports=True, **kwargs
+            )
+        )
+        assert [result for result, _ in results] == [result for result, _ in expected]
+        assert [[(k, v) for _, k, v in reports] for _, reports in results] == [
+            invalid for _, invalid in expected
+        ]
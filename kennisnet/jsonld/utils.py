@@ -24,6 +24,8 @@
 ## end license ##
 
 from seecr.zulutime import ZuluTime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 
 def as_value(v, l):
@@ -44,15 +46,81 @@ def pretty_print_uuid(s):
         return s
 
 
-def normalize_datetime(date):
-    if not date:
-        return None
+iso_datetime_r = re.compile(
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2})"
+    r"(?:T([0-9]{2}):([0-9]{2}):([0-9]{2})(Z|([+-])([0-9]{2}):([0-9]{2})))?"
+)
+
+
+def _zulu(date):
     try:
         return ZuluTime(date).zulu()
     except:
         return None
 
 
+def _fast_zulu(date):
+    """Zulu time for YYYY-MM-DD, YYYY-MM-DDTHH:MM:SSZ and YYYY-MM-DDTHH:MM:SS+HH:MM
+    without ZuluTime; None for anything else."""
+    m = iso_datetime_r.fullmatch(date)
+    if m is None:
+        return None
+    year, month, day, hour, minute, second, zone, sign, tzh, tzm = m.groups()
+    try:
+        if hour is None:
+            dt = datetime(int(year), int(month), int(day))
+        else:
+            offset = timedelta(0)
+            if zone != "Z":
+                offset = timedelta(hours=int(tzh), minutes=int(tzm))
+                if sign == "-":
+                    offset = -offset
+            dt = datetime(
+                int(year),
+                int(month),
+                int(day),
+                int(hour),
+                int(minute),
+                int(second),
+                tzinfo=timezone(offset),
+            ).astimezone(timezone.utc)
+    except (ValueError, OverflowError):
+        return None
+    if dt.year < 1000:
+        return None
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@lru_cache(maxsize=8192)
+def _normalize_datetime_str(date):
+    return _fast_zulu(date) or _zulu(date)
+
+
+def normalize_datetime(date):
+    if not date:
+        return None
+    if type(date) is str:
+        return _normalize_datetime_str(date)
+    return _zulu(date)
+
+
+def find_tuple(data, path=()):
+    """Path (keys and indexes) to the first tuple in data, None if there is
+    none; data is made of dicts, lists and plain values."""
+    if isinstance(data, tuple):
+        return path
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return None
+    for key, value in items:
+        if (found := find_tuple(value, path + (key,))) is not None:
+            return found
+    return None
+
+
 class _Any:
     def __init__(self, f=None):
         self.f = f
@@ -23,7 +23,13 @@
 #
 ## end license ##
 
-from .utils import pretty_print_uuid, normalize_datetime
+from .utils import (
+    pretty_print_uuid,
+    normalize_datetime,
+    find_tuple,
+    _fast_zulu,
+    _zulu,
+)
 
 
 def test_uuid_pretty_print():
@@ -54,3 +60,39 @@ def test_normalize_datetime():
     assert normalize_datetime("2023-01-11") == "2023-01-11T00:00:00Z"
     assert normalize_datetime("last year") == None
     assert normalize_datetime(None) == None
+
+
+def test_normalize_datetime_fast_path_same_as_zulutime():
+    for date in [
+        "2023-01-11T12:34:56Z",
+        "2023-01-11T12:34:56+00:00",
+        "2023-01-11T12:34:56-00:00",
+        "2023-01-11T13:34:56+01:00",
+        "2023-01-01T00:30:00+01:00",
+        "2023-12-31T23:30:00-01:30",
+        "2024-02-29T23:59:59+14:00",
+        "2023-01-11",
+        "2024-02-29",
+        "1970-01-01T00:00:00Z",
+        "1000-01-01",
+    ]:
+        assert _fast_zulu(date) is not None
+        assert _fast_zulu(date) == _zulu(date), date
+    for date in [
+        "2023-02-30",
+        "2023-13-01",
+        "2023-01-11T24:00:00Z",
+        "2023-01-11T12:34:56",
+        "2023-01-11T12:34:56.123Z",
+        "2023-01-11 12:34:56Z",
+        "0999-01-01",
+        "last year",
+    ]:
+        assert _fast_zulu(date) is None, date
+        assert normalize_datetime(date) == _zulu(date)
+
+
+def test_find_tuple():
+    assert find_tuple({"a": [{"@value": 1}], "b": "text"}) is None
+    assert find_tuple({"a": [{"@value": 1}, {"b": ({"@value": 2},)}]}) == ("a", 1, "b")
+    assert find_tuple(("a",)) == ()
@@ -0,0 +1,248 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+"""Lookup object on a local vocabulary dump.
+
+A dump holds concepts, as a JSON list, a JSON object {"@graph": [...]} or
+{scheme: [...]}, or as NDJSON (one concept per line, files ending in
+.ndjson or .jsonl). A concept looks like:
+
+    {"scheme": "urn:edurep:conceptset",
+     "id": "http://purl.edustandaard.nl/begrippenkader/...",
+     "identifier": "...", "source": "http://purl.edustandaard.nl/begrippenkader",
+     "prefLabel": {"nl": "VO"}, "altLabel": {"nl": ["Voortgezet onderwijs"]},
+     "hiddenLabel": [["vo", "nl"]], "exactMatch": "...", "type": "..."}
+
+SKOS-like keys (@id, notation, inScheme, skos:prefLabel, ...) are accepted
+as well, see parse_concept.
+"""
+
+from .lookup import LookupResult
+from contextlib import contextmanager
+from sys import getsizeof, intern
+import gc
+import json
+
+_empty = LookupResult()
+
+_fields = {
+    "id": ("id", "@id"),
+    "identifier": ("identifier", "notation", "skos:notation"),
+    "source": ("source", "inScheme", "skos:inScheme"),
+    "uri": ("uri",),
+    "exactMatch": ("exactMatch", "skos:exactMatch"),
+    "type": ("type",),
+}
+_label_kinds = (
+    ("prefLabel", "skos:prefLabel", "labels"),
+    ("altLabel", "skos:altLabel"),
+    ("hiddenLabel", "skos:hiddenLabel"),
+)
+
+
+def _first(concept, keys):
+    for key in keys:
+        if (value := concept.get(key)) is not None:
+            if type(value) is str:
+                return value
+            if isinstance(value, list):
+                value = value[0] if value else None
+            if isinstance(value, dict):
+                value = value.get("@id", value.get("@value"))
+            return value
+    return None
+
+
+def _labels(value):
+    """(label, language) pairs from a {language: label(s)} map, a list of
+    [label, language] pairs, {"@value": ..., "@language": ...} dicts or
+    plain strings."""
+    if isinstance(value, (str, dict)):
+        value = [value]
+    for item in value:
+        if isinstance(item, str):
+            yield item, None
+        elif isinstance(item, (list, tuple)):
+            yield tuple(item) if len(item) == 2 else (item[0], None)
+        elif "@value" in item:
+            yield item["@value"], item.get("@language")
+        else:
+            for lang, labels in item.items():
+                for label in [labels] if isinstance(labels, str) else labels:
+                    yield label, lang
+
+
+def _intern(value):
+    return intern(value) if isinstance(value, str) else value
+
+
+def _label_pairs(concept, keys):
+    for key in keys:
+        if (value := concept.get(key)) is not None:
+            return [(label, _intern(lang)) for label, lang in _labels(value)]
+    return []
+
+
+def parse_concept(concept):
+    """Returns the LookupResult for a concept, with its preferred labels as
+    labels, and the values it is found by with lookupByValue per priority:
+    its identifier, preferred, alternative and hidden labels."""
+    pref, alt, hidden = (_label_pairs(concept, keys) for keys in _label_kinds)
+    identifier = _first(concept, _fields["identifier"])
+    result = LookupResult(
+        id=_first(concept, _fields["id"]),
+        identifier=identifier,
+        source=_intern(_first(concept, _fields["source"])),
+        labels=tuple(pref),
+        uri=_first(concept, _fields["uri"]),
+        exactMatch=_first(concept, _fields["exactMatch"]),
+        type=_intern(_first(concept, _fields["type"])),
+    )
+    values = (
+        [] if identifier is None else [identifier],
+        [label for label, _ in pref],
+        [label for label, _ in alt],
+        [label for label, _ in hidden],
+    )
+    return result, values
+
+
+def fold(value):
+    """Values are matched case-insensitively."""
+    return value.casefold() if isinstance(value, str) else value
+
+
+def read_concepts(path, scheme=None):
+    """Yields (scheme, concept) from a dump; scheme is the default for concepts
+    without one."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            data = (json.loads(line) for line in f if line.strip())
+        else:
+            data = json.load(f)
+        if isinstance(data, dict):
+            if "@graph" in data:
+                data = data["@graph"]
+            else:
+                data = (
+                    concept | {"scheme": concept.get("scheme", s)}
+                    for s, concepts in data.items()
+                    for concept in concepts
+                )
+        for concept in data:
+            yield concept.get("scheme", scheme), concept
+
+
+@contextmanager
+def _gc_paused():
+    # loading creates millions of objects that all stay alive, the cyclic
+    # garbage collector would scan them over and over for nothing
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class VocabularyLookup:
+    """In memory lookup object on concepts per scheme, see read_concepts.
+    lookupByValue matches identifiers and preferred, alternative and hidden
+    labels case-insensitively, in that order of preference when concepts
+    share a value; lookupById matches ids exactly. Reports are ignored."""
+
+    def __init__(self, concepts=()):
+        self.by_value = {}
+        self.by_id = {}
+        self.add(concepts)
+
+    @classmethod
+    def from_file(cls, path, scheme=None):
+        return cls(read_concepts(path, scheme))
+
+    def add(self, concepts):
+        """Adds (scheme, concept) pairs; values and ids already known keep
+        their concept."""
+        with _gc_paused():
+            self._add(concepts)
+
+    def _add(self, concepts):
+        parsed = []
+        for scheme, concept in concepts:
+            if scheme is None:
+                raise ValueError(f"No scheme for concept {concept!r}")
+            scheme = intern(scheme)
+            result, values = parse_concept(concept)
+            if result.id is not None:
+                self.by_id.setdefault(scheme, {}).setdefault(result.id, result)
+            parsed.append((self.by_value.setdefault(scheme, {}), result, values))
+        for priority in range(len(_label_kinds) + 1):
+            for by_value, result, values in parsed:
+                for value in values[priority]:
+                    by_value.setdefault(fold(value), result)
+
+    def schemes(self):
+        return sorted(self.by_value.keys() | self.by_id.keys())
+
+    def memory_usage(self):
+        """Approximate bytes used per scheme by the indexes and the results."""
+        usage = {}
+        for scheme in self.schemes():
+            seen = set()
+            size = 0
+            for index in (self.by_value.get(scheme, {}), self.by_id.get(scheme, {})):
+                size += getsizeof(index)
+                for key, result in index.items():
+                    size += getsizeof(key)
+                    if id(result) not in seen:
+                        seen.add(id(result))
+                        size += _result_size(result, seen)
+            usage[scheme] = size
+        return usage
+
+    def report_invalid(self, key, value):
+        pass
+
+    def report_not_found(self, key, value):
+        pass
+
+    def lookupById(self, scheme, value):
+        return self.by_id.get(scheme, {}).get(value, _empty)
+
+    def lookupByValue(self, scheme, value):
+        return self.by_value.get(scheme, {}).get(fold(value), _empty)
+
+
+def _result_size(result, seen):
+    size = getsizeof(result) + getsizeof(result.labels)
+    for value in (*result[:3], *result[4:], *(v for l in result.labels for v in l)):
+        if value is not None and id(value) not in seen:
+            seen.add(id(value))
+            size += getsizeof(value)
+    return size + sum(getsizeof(l) for l in result.labels)
+
+
+__all__ = ["VocabularyLookup"]
@@ -0,0 +1,269 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+"""Vocabulary index file for MappedLookup.
+
+compile_index writes the indexes of a VocabularyLookup to a file that
+MappedLookup memory-maps, so worker processes share the pages through the
+page cache instead of each building dicts from a dump:
+
+python -m kennisnet.jsonld.vocabulary_index vocabulary.ndjson vocabulary.idx
+
+The file starts with a header (magic and the positions of the tables),
+followed by three tables of strings: the results as JSON arrays, and the
+sorted value and id keys ("scheme\\0value") with the result number for each
+key. A table is an array of n + 1 offsets into its blob of UTF-8 strings.
+"""
+
+from .lookup import LookupResult
+from .vocabulary import VocabularyLookup, fold
+from argparse import ArgumentParser
+from array import array
+from bisect import bisect_left
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"KNVIDX1\0"
+_header = struct.Struct("<8s11Q")
+_empty = LookupResult()
+
+
+def _key(scheme, value):
+    return f"{scheme}\0{value}".encode("utf-8")
+
+
+class _Writer:
+    def __init__(self, f):
+        self.f = f
+
+    def pad(self):
+        self.f.write(b"\0" * (-self.f.tell() % 8))
+
+    def strings(self, strings):
+        """Writes offsets and blob, returns their positions."""
+        offsets = array("Q", [0])
+        for s in strings:
+            offsets.append(offsets[-1] + len(s))
+        self.pad()
+        offsets_pos = self.f.tell()
+        self.f.write(offsets.tobytes())
+        blob_pos = self.f.tell()
+        for s in strings:
+            self.f.write(s)
+        return offsets_pos, blob_pos
+
+    def numbers(self, numbers):
+        self.pad()
+        pos = self.f.tell()
+        self.f.write(array("Q", numbers).tobytes())
+        return pos
+
+
+def compile_index(lookup, path):
+    """Writes the indexes of a VocabularyLookup to path."""
+    results, numbers = [], {}
+
+    def number(result):
+        if id(result) not in numbers:
+            numbers[id(result)] = len(results)
+            results.append(result)
+        return numbers[id(result)]
+
+    def keys(index):
+        entries = sorted(
+            (_key(scheme, key), number(result))
+            for scheme, results in index.items()
+            for key, result in results.items()
+            if isinstance(key, str)
+        )
+        return [k for k, _ in entries], [n for _, n in entries]
+
+    value_keys, value_targets = keys(lookup.by_value)
+    id_keys, id_targets = keys(lookup.by_id)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        w = _Writer(f)
+        f.write(b"\0" * _header.size)
+        results_pos = w.strings(
+            [
+                json.dumps(list(r), ensure_ascii=False, separators=(",", ":")).encode(
+                    "utf-8"
+                )
+                for r in results
+            ]
+        )
+        values_pos = w.strings(value_keys)
+        values_targets_pos = w.numbers(value_targets)
+        ids_pos = w.strings(id_keys)
+        ids_targets_pos = w.numbers(id_targets)
+        f.seek(0)
+        f.write(
+            _header.pack(
+                MAGIC,
+                len(results),
+                *results_pos,
+                len(value_keys),
+                *values_pos,
+                values_targets_pos,
+                len(id_keys),
+                *ids_pos,
+                ids_targets_pos,
+            )
+        )
+    os.replace(tmp, path)
+
+
+def compile_dump(dump_path, path, scheme=None):
+    compile_index(VocabularyLookup.from_file(dump_path, scheme), path)
+
+
+class _Strings:
+    """Sequence of the bytes strings in a table, sliced from the mapping."""
+
+    def __init__(self, mm, n, offsets_pos, blob_pos):
+        self._mm = mm
+        self._offsets = memoryview(mm)[offsets_pos : offsets_pos + 8 * (n + 1)].cast(
+            "Q"
+        )
+        self._blob_pos = blob_pos
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        return self._mm[
+            self._blob_pos + self._offsets[i] : self._blob_pos + self._offsets[i + 1]
+        ]
+
+    def release(self):
+        self._offsets.release()
+
+
+class _Keys:
+    def __init__(self, mm, n, offsets_pos, blob_pos, targets_pos):
+        self.keys = _Strings(mm, n, offsets_pos, blob_pos)
+        self._targets = memoryview(mm)[targets_pos : targets_pos + 8 * n].cast("Q")
+
+    def find(self, key):
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self._targets[i]
+        return None
+
+    def release(self):
+        self.keys.release()
+        self._targets.release()
+
+
+class MappedLookup:
+    """Lookup object on an index file written by compile_index, with the
+    same results as the VocabularyLookup it was compiled from. Keys are
+    found with a binary search in the mapped file and only the results
+    looked up are decoded. Reports are ignored."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            n_results,
+            results_offsets,
+            results_blob,
+            n_values,
+            values_offsets,
+            values_blob,
+            values_targets,
+            n_ids,
+            ids_offsets,
+            ids_blob,
+            ids_targets,
+        ) = _header.unpack_from(self._mm)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a vocabulary index: {path}")
+        self._results = _Strings(self._mm, n_results, results_offsets, results_blob)
+        self._values = _Keys(
+            self._mm, n_values, values_offsets, values_blob, values_targets
+        )
+        self._ids = _Keys(self._mm, n_ids, ids_offsets, ids_blob, ids_targets)
+
+    def _result(self, n):
+        if n is None:
+            return _empty
+        id, identifier, source, labels, uri, exactMatch, type = json.loads(
+            self._results[n]
+        )
+        return LookupResult(
+            id=id,
+            identifier=identifier,
+            source=source,
+            labels=tuple(tuple(l) for l in labels),
+            uri=uri,
+            exactMatch=exactMatch,
+            type=type,
+        )
+
+    def report_invalid(self, key, value):
+        pass
+
+    def report_not_found(self, key, value):
+        pass
+
+    def lookupById(self, scheme, value):
+        if not isinstance(value, str):
+            return _empty
+        return self._result(self._ids.find(_key(scheme, value)))
+
+    def lookupByValue(self, scheme, value):
+        if not isinstance(value, str):
+            return _empty
+        return self._result(self._values.find(_key(scheme, fold(value))))
+
+    def close(self):
+        self._results.release()
+        self._values.release()
+        self._ids.release()
+        self._mm.close()
+
+
+__all__ = ["MappedLookup", "compile_index", "compile_dump"]
+
+
+def main(argv=None):
+    parser = ArgumentParser(
+        description="Compile a vocabulary dump into an index file for MappedLookup."
+    )
+    parser.add_argument("dump", help="JSON or NDJSON vocabulary dump")
+    parser.add_argument("index", help="index file to write")
+    parser.add_argument("--scheme", help="scheme of concepts without one")
+    args = parser.parse_args(argv)
+    compile_dump(args.dump, args.index, args.scheme)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .vocabulary import VocabularyLookup
+from .vocabulary_index import MappedLookup, compile_index, main
+from .vocabulary_test import concepts, conceptset
+
+import json
+import pytest
+
+
+def lookups(lookup):
+    return [
+        lookup.lookupByValue(conceptset, "VO"),
+        lookup.lookupByValue(conceptset, "voortgezet onderwijs"),
+        lookup.lookupByValue(conceptset, "Havo"),
+        lookup.lookupByValue(conceptset, "unknown"),
+        lookup.lookupByValue(conceptset, True),
+        lookup.lookupByValue("urn:lms:license", "CC BY 4.0"),
+        lookup.lookupById(conceptset, "http://purl.edustandaard.nl/begrippenkader/vo"),
+        lookup.lookupById(conceptset, "unknown"),
+        lookup.lookupById("urn:lms:license", "cc-by-40"),
+        lookup.lookupById("urn:unknown", "cc-by-40"),
+    ]
+
+
+def test_same_results(tmp_path):
+    vocabulary = VocabularyLookup((c["scheme"], c) for c in concepts)
+    compile_index(vocabulary, str(tmp_path / "vocabulary.idx"))
+    mapped = MappedLookup(str(tmp_path / "vocabulary.idx"))
+    try:
+        assert lookups(mapped) == lookups(vocabulary)
+        assert mapped.lookupByValue(conceptset, "vo").labels == (("VO", "nl"),)
+    finally:
+        mapped.close()
+
+
+def test_empty(tmp_path):
+    compile_index(VocabularyLookup(), str(tmp_path / "empty.idx"))
+    mapped = MappedLookup(str(tmp_path / "empty.idx"))
+    assert mapped.lookupByValue(conceptset, "vo") == VocabularyLookup().lookupByValue(
+        conceptset, "vo"
+    )
+    mapped.close()
+
+
+def test_not_an_index(tmp_path):
+    (tmp_path / "dump.json").write_text(json.dumps(concepts) + " " * 100)
+    with pytest.raises(ValueError):
+        MappedLookup(str(tmp_path / "dump.json"))
+
+
+def test_main(tmp_path):
+    (tmp_path / "dump.ndjson").write_text("\n".join(json.dumps(c) for c in concepts))
+    main([str(tmp_path / "dump.ndjson"), str(tmp_path / "vocabulary.idx")])
+    mapped = MappedLookup(str(tmp_path / "vocabulary.idx"))
+    assert mapped.lookupByValue(conceptset, "secondary education").identifier == "vo"
+    mapped.close()
@@ -0,0 +1,134 @@
+## begin license ##
+#
+# "Kennisnet Json-LD" provides tools for handling tools
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+# Copyright (C) 2026 Stichting Kennisnet https://www.kennisnet.nl
+#
+# This file is part of "Kennisnet Json-LD"
+#
+# "Kennisnet Json-LD" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Kennisnet Json-LD" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Kennisnet Json-LD"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from .vocabulary import VocabularyLookup, read_concepts
+from .lookup import LookupResult
+
+import json
+import pytest
+
+conceptset = "urn:edurep:conceptset"
+begrippenkader = "http://purl.edustandaard.nl/begrippenkader"
+
+concepts = [
+    {
+        "scheme": conceptset,
+        "id": f"{begrippenkader}/vo",
+        "identifier": "vo",
+        "source": begrippenkader,
+        "prefLabel": {"nl": "VO"},
+        "altLabel": {"nl": ["Voortgezet onderwijs"], "en": "Secondary education"},
+        "hiddenLabel": ["middelbare school"],
+        "type": "http://purl.edustandaard.nl/begrippenkader/EducationalLevel",
+    },
+    {
+        "scheme": conceptset,
+        "@id": f"{begrippenkader}/havo",
+        "skos:notation": "havo",
+        "skos:inScheme": {"@id": begrippenkader},
+        "skos:prefLabel": [{"@value": "HAVO", "@language": "nl"}],
+        "skos:hiddenLabel": [{"@value": "VO", "@language": "nl"}],
+        "skos:exactMatch": [{"@id": f"{begrippenkader}/vo"}],
+    },
+    {
+        "scheme": "urn:lms:license",
+        "id": "cc-by-40",
+        "uri": "http://creativecommons.org/licenses/by/4.0/",
+        "labels": [["CC BY 4.0", "nl"]],
+    },
+]
+
+
+def test_lookup():
+    lookup = VocabularyLookup((c["scheme"], c) for c in concepts)
+    vo = lookup.lookupById(conceptset, f"{begrippenkader}/vo")
+    assert vo == LookupResult(
+        id=f"{begrippenkader}/vo",
+        identifier="vo",
+        source=begrippenkader,
+        labels=(("VO", "nl"),),
+        type="http://purl.edustandaard.nl/begrippenkader/EducationalLevel",
+    )
+    for value in ["vo", "VO", "voortgezet ONDERWIJS", "Secondary education"]:
+        assert lookup.lookupByValue(conceptset, value) is vo
+    assert lookup.lookupByValue(conceptset, "Middelbare School") is vo
+    havo = lookup.lookupByValue(conceptset, "havo")
+    assert havo == LookupResult(
+        id=f"{begrippenkader}/havo",
+        identifier="havo",
+        source=begrippenkader,
+        labels=(("HAVO", "nl"),),
+        exactMatch=f"{begrippenkader}/vo",
+    )
+    assert lookup.lookupByValue(conceptset, "unknown") == LookupResult()
+    assert lookup.lookupByValue("urn:unknown", "vo") == LookupResult()
+    assert lookup.lookupById(conceptset, f"{begrippenkader}/VO") == LookupResult()
+    license = lookup.lookupById("urn:lms:license", "cc-by-40")
+    assert license.labels == (("CC BY 4.0", "nl"),)
+    assert lookup.lookupByValue("urn:lms:license", "cc by 4.0") is license
+
+
+def test_labels_prefer_identifier_and_prefLabel():
+    lookup = VocabularyLookup(
+        [
+            (conceptset, {"id": "a", "hiddenLabel": "x", "altLabel": "y"}),
+            (conceptset, {"id": "b", "prefLabel": "y", "identifier": "z"}),
+            (conceptset, {"id": "c", "altLabel": "x", "prefLabel": "z"}),
+        ]
+    )
+    assert lookup.lookupByValue(conceptset, "x").id == "c"
+    assert lookup.lookupByValue(conceptset, "y").id == "b"
+    assert lookup.lookupByValue(conceptset, "z").id == "b"
+
+
+@pytest.mark.parametrize("name", ["dump.ndjson", "dump.json", "graph.json"])
+def test_from_file(tmp_path, name):
+    if name.endswith(".ndjson"):
+        content = "\n".join(json.dumps(c) for c in concepts) + "\n"
+    elif name == "graph.json":
+        content = json.dumps({"@graph": concepts})
+    else:
+        by_scheme = {}
+        for c in concepts:
+            c = dict(c)
+            by_scheme.setdefault(c.pop("scheme"), []).append(c)
+        content = json.dumps(by_scheme)
+    (tmp_path / name).write_text(content)
+    lookup = VocabularyLookup.from_file(str(tmp_path / name))
+    assert lookup.schemes() == [conceptset, "urn:lms:license"]
+    assert lookup.lookupByValue(conceptset, "HAVO").identifier == "havo"
+
+    usage = lookup.memory_usage()
+    assert set(usage) == {conceptset, "urn:lms:license"}
+    assert usage[conceptset] > usage["urn:lms:license"] > 0
+
+
+def test_default_scheme(tmp_path):
+    (tmp_path / "dump.jsonl").write_text(json.dumps({"id": "a", "prefLabel": "A"}))
+    assert list(read_concepts(str(tmp_path / "dump.jsonl"), "urn:x")) == [
+        ("urn:x", {"id": "a", "prefLabel": "A"})
+    ]
+    with pytest.raises(ValueError):
+        VocabularyLookup.from_file(str(tmp_path / "dump.jsonl"))
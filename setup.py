@@ -43,6 +43,11 @@ setup(
     long_description=long_description,
     long_description_content_type='text/markdown',
     packages=packages,
+    entry_points={
+        'console_scripts': [
+            'kennisnet-jsonld-enrich = kennisnet.jsonld.cli:main',
+        ],
+    },
     author='Seecr',
     author_email='info@seecr.nl',
     url='https://github.com/seecr/kennisnet-jsonld',